@@ -0,0 +1,160 @@
+# case_comparison.py
+"""
+Comparação vetorizada entre dois casos (.PWF) ou dois cenários resolvidos.
+
+Cada caso é convertido uma única vez em arrays por campo (CaseArrays),
+ordenados pela chave do elemento (número da barra, ID 'de-para-circuito'
+do ramo). O alinhamento é uma junção de arrays ordenados, e as diferenças
+são calculadas coluna a coluna, sem percorrer objetos.
+
+Uso:
+    python case_comparison.py CASO_A.PWF CASO_B.PWF [--top 20]
+"""
+import argparse
+import numpy as np
+from power_system_model import PowerSystem
+from pwf_parser import parse_pwf_file
+
+BUS_COMPARE_FIELDS = ('status', 'voltage', 'angle', 'p_load', 'q_load', 'p_gen', 'q_gen',
+                      'shunt_b', 'v_result', 'angle_result')
+BRANCH_COMPARE_FIELDS = ('status', 'r', 'x', 'shunt_b', 'tap', 'rating_normal',
+                         'p_from', 'q_from', 'p_to', 'q_to', 'loading')
+
+# Diferença mínima (valor absoluto) para que um campo seja considerado alterado
+DEFAULT_THRESHOLDS = {
+    'status': 0.5,
+    'voltage': 1e-3, 'angle': 0.01,
+    'p_load': 0.01, 'q_load': 0.01, 'p_gen': 0.01, 'q_gen': 0.01, 'shunt_b': 0.01,
+    'v_result': 1e-3, 'angle_result': 0.1,
+    'r': 1e-5, 'x': 1e-5, 'tap': 1e-4, 'rating_normal': 0.5,
+    'p_from': 1.0, 'q_from': 1.0, 'p_to': 1.0, 'q_to': 1.0, 'loading': 1.0,
+}
+
+def _field_array(objects, field):
+    """ Array float de um atributo; resultados ausentes (None) viram NaN. """
+    return np.array([getattr(obj, field) for obj in objects], dtype=float)
+
+class CaseArrays:
+    """
+    Cópia colunar de um PowerSystem para comparação: chaves ordenadas e um
+    array por campo. Por ser uma cópia, serve também como retrato de um
+    cenário resolvido que pode ser comparado depois de o sistema mudar.
+    """
+    def __init__(self, system: PowerSystem, title=None):
+        self.title = title or system.title
+
+        bus_numbers = np.fromiter(system.buses.keys(), dtype=np.int64, count=len(system.buses))
+        order = np.argsort(bus_numbers, kind='stable')
+        buses = list(system.buses.values())
+        self.bus_keys = bus_numbers[order]
+        self.bus_values = {field: _field_array(buses, field)[order]
+                           for field in BUS_COMPARE_FIELDS}
+
+        branch_ids = np.array(list(system.branches.keys()), dtype=str)
+        order = np.argsort(branch_ids, kind='stable')
+        branches = list(system.branches.values())
+        self.branch_keys = branch_ids[order]
+        self.branch_values = {field: _field_array(branches, field)[order]
+                              for field in BRANCH_COMPARE_FIELDS}
+
+def align_keys(keys_a, keys_b):
+    """
+    Junção de dois arrays de chaves ordenados e sem repetição.
+    Retorna (índices comuns em A, índices comuns em B, só em A, só em B).
+    """
+    _, idx_a, idx_b = np.intersect1d(keys_a, keys_b, assume_unique=True, return_indices=True)
+    only_a = np.setdiff1d(keys_a, keys_b, assume_unique=True)
+    only_b = np.setdiff1d(keys_b, keys_a, assume_unique=True)
+    return idx_a, idx_b, only_a, only_b
+
+def _compare_fields(values_a, values_b, keys, idx_a, idx_b, thresholds):
+    """ {campo: (chaves, valor em A, valor em B)} das diferenças acima do limite. """
+    deltas = {}
+    for field in values_a:
+        a = values_a[field][idx_a]
+        b = values_b[field][idx_b]
+        diff = np.abs(b - a)
+        # Campos sem valor em um dos casos (ex: sem resultado) não são comparados
+        changed = ~np.isnan(diff) & (diff > thresholds.get(field, 0.0))
+        if changed.any():
+            deltas[field] = (keys[changed], a[changed], b[changed])
+    return deltas
+
+class CaseComparison:
+    """
+    Diferenças de B em relação a A: elementos incluídos/retirados e campos
+    (parâmetros e resultados) que mudaram além dos limites.
+    """
+    def __init__(self, case_a, case_b, thresholds=None):
+        self.case_a = case_a if isinstance(case_a, CaseArrays) else CaseArrays(case_a)
+        self.case_b = case_b if isinstance(case_b, CaseArrays) else CaseArrays(case_b)
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        a, b = self.case_a, self.case_b
+
+        idx_a, idx_b, self.removed_buses, self.added_buses = align_keys(a.bus_keys, b.bus_keys)
+        self.bus_deltas = _compare_fields(a.bus_values, b.bus_values, a.bus_keys[idx_a],
+                                          idx_a, idx_b, self.thresholds)
+
+        idx_a, idx_b, self.removed_branches, self.added_branches = align_keys(a.branch_keys, b.branch_keys)
+        self.branch_deltas = _compare_fields(a.branch_values, b.branch_values, a.branch_keys[idx_a],
+                                             idx_a, idx_b, self.thresholds)
+
+    def changed_buses(self):
+        """ {número da barra: [campos alterados]} """
+        return self._changed(self.bus_deltas, int)
+
+    def changed_branches(self):
+        """ {ID do ramo: [campos alterados]} """
+        return self._changed(self.branch_deltas, str)
+
+    @staticmethod
+    def _changed(deltas, cast):
+        changed = {}
+        for field, (keys, _, _) in deltas.items():
+            for key in keys.tolist():
+                changed.setdefault(cast(key), []).append(field)
+        return changed
+
+    def summary(self, top=10):
+        """ Relatório em texto, com as maiores diferenças de cada campo. """
+        lines = [f"Comparação: '{self.case_a.title}' -> '{self.case_b.title}'",
+                 f"Barras: {len(self.added_buses)} incluídas, {len(self.removed_buses)} retiradas, "
+                 f"{len(self.changed_buses())} alteradas.",
+                 f"Ramos: {len(self.added_branches)} incluídos, {len(self.removed_branches)} retirados, "
+                 f"{len(self.changed_branches())} alterados."]
+        for label, keys in (("Barras incluídas", self.added_buses), ("Barras retiradas", self.removed_buses),
+                            ("Ramos incluídos", self.added_branches), ("Ramos retirados", self.removed_branches)):
+            if len(keys):
+                shown = ", ".join(str(k) for k in keys[:top].tolist())
+                lines.append(f"{label}: {shown}{' ...' if len(keys) > top else ''}")
+
+        for kind, deltas in (("Barra", self.bus_deltas), ("Ramo", self.branch_deltas)):
+            for field, (keys, a, b) in deltas.items():
+                lines.append(f"--- {kind}s com '{field}' alterado ({len(keys)}) ---")
+                for i in np.argsort(-np.abs(b - a), kind='stable')[:top]:
+                    lines.append(f"  {kind} {keys[i]}: {a[i]:.4f} -> {b[i]:.4f} ({b[i] - a[i]:+.4f})")
+        return "\n".join(lines)
+
+def load_case(filepath):
+    system = PowerSystem()
+    system.load_from_pwf(parse_pwf_file(filepath))
+    return system
+
+def compare_cases(case_a, case_b, thresholds=None):
+    """ Compara dois casos (PowerSystem, CaseArrays ou caminho de .PWF). """
+    if isinstance(case_a, str):
+        case_a = load_case(case_a)
+    if isinstance(case_b, str):
+        case_b = load_case(case_b)
+    return CaseComparison(case_a, case_b, thresholds)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dois casos .PWF.")
+    parser.add_argument('case_a')
+    parser.add_argument('case_b')
+    parser.add_argument('--top', type=int, default=20, help="Maiores diferenças listadas por campo")
+    args = parser.parse_args()
+    print(compare_cases(args.case_a, args.case_b).summary(args.top))
+
+if __name__ == "__main__":
+    main()
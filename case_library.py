@@ -0,0 +1,162 @@
+# case_library.py
+"""
+Biblioteca indexada de casos .PWF.
+
+Varre diretórios em paralelo (leitura só de cabeçalho) e mantém um índice
+persistente em SQLite, atualizado de forma incremental: só arquivos novos
+ou modificados (tamanho/data) são lidos de novo.
+
+Uso:
+    python case_library.py [--index casos.db] scan DIRETORIO [...]
+    python case_library.py find --bus 3459
+    python case_library.py find --name S.JOSE
+    python case_library.py find --title Maxima-Diurna
+"""
+import argparse
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pwf_parser import parse_pwf_header
+
+DEFAULT_INDEX = "fluxy_casos.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    title TEXT,
+    n_buses INTEGER,
+    n_branches INTEGER
+);
+CREATE TABLE IF NOT EXISTS buses (
+    path TEXT NOT NULL REFERENCES cases(path) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    name TEXT,
+    area INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_buses_number ON buses(number);
+CREATE INDEX IF NOT EXISTS idx_buses_name ON buses(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_buses_path ON buses(path);
+"""
+
+def _read_header(path):
+    """ Executado nos processos de trabalho. """
+    try:
+        return path, parse_pwf_header(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+def find_pwf_files(directories):
+    """ Lista recursivamente os arquivos .PWF dos diretórios dados. """
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.lower().endswith('.pwf'):
+                    yield os.path.abspath(os.path.join(root, name))
+
+class CaseLibrary:
+    """ Índice persistente de casos .PWF (título, barras, áreas, nº de ramos). """
+    def __init__(self, index_path=DEFAULT_INDEX):
+        self.conn = sqlite3.connect(index_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def scan(self, directories, n_workers=None, progress=None):
+        """
+        Atualiza o índice com os .PWF dos diretórios. Retorna
+        (novos/alterados, removidos, erros).
+        """
+        known = {path: (mtime, size) for path, mtime, size
+                 in self.conn.execute("SELECT path, mtime, size FROM cases")}
+        seen = set()
+        changed = []
+        for path in find_pwf_files(directories):
+            seen.add(path)
+            stat = os.stat(path)
+            if known.get(path) != (stat.st_mtime, stat.st_size):
+                changed.append((path, stat.st_mtime, stat.st_size))
+
+        # Arquivos que sumiram dos diretórios varridos
+        roots = tuple(os.path.join(os.path.abspath(d), '') for d in directories)
+        removed = [path for path in known if path.startswith(roots) and path not in seen]
+        self.conn.executemany("DELETE FROM cases WHERE path = ?", [(p,) for p in removed])
+
+        errors = []
+        stats = {path: (mtime, size) for path, mtime, size in changed}
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = pool.map(_read_header, [path for path, _, _ in changed], chunksize=16)
+            for done, (path, header, error) in enumerate(results, start=1):
+                if error:
+                    errors.append((path, error))
+                    print(f"Erro ao indexar {path}: {error}")
+                    continue
+                self._store(path, *stats[path], header)
+                if progress:
+                    progress(done, len(changed))
+
+        self.conn.commit()
+        return len(changed) - len(errors), len(removed), errors
+
+    def _store(self, path, mtime, size, header):
+        self.conn.execute("DELETE FROM cases WHERE path = ?", (path,))
+        self.conn.execute(
+            "INSERT INTO cases (path, mtime, size, title, n_buses, n_branches) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, mtime, size, header['title'], len(header['buses']), header['n_branches']))
+        self.conn.executemany(
+            "INSERT INTO buses (path, number, name, area) VALUES (?, ?, ?, ?)",
+            [(path, number, name, area) for number, name, area in header['buses']])
+
+    def find_by_bus(self, number=None, name=None):
+        """ Casos que contêm a barra (por número e/ou nome, parcial e sem caixa). """
+        query = ("SELECT DISTINCT c.path, c.title, b.number, b.name, b.area "
+                 "FROM buses b JOIN cases c ON c.path = b.path WHERE 1 = 1")
+        params = []
+        if number is not None:
+            query += " AND b.number = ?"
+            params.append(number)
+        if name:
+            query += " AND b.name LIKE ? COLLATE NOCASE"
+            params.append(f"%{name}%")
+        return self.conn.execute(query + " ORDER BY c.path", params).fetchall()
+
+    def find_by_title(self, text):
+        """ Casos cujo título (TITU) contém o texto. """
+        return self.conn.execute(
+            "SELECT path, title, n_buses, n_branches FROM cases WHERE title LIKE ? COLLATE NOCASE ORDER BY path",
+            (f"%{text}%",)).fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description="Biblioteca indexada de casos .PWF.")
+    parser.add_argument('--index', default=DEFAULT_INDEX, help="Arquivo do índice (SQLite)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scan_cmd = commands.add_parser('scan', help="Indexa (ou atualiza) diretórios")
+    scan_cmd.add_argument('directories', nargs='+')
+    scan_cmd.add_argument('--workers', type=int, default=None)
+
+    find_cmd = commands.add_parser('find', help="Consulta o índice")
+    find_cmd.add_argument('--bus', type=int, help="Número da barra")
+    find_cmd.add_argument('--name', help="Nome (ou parte do nome) da barra")
+    find_cmd.add_argument('--title', help="Texto do título do caso")
+
+    args = parser.parse_args()
+    library = CaseLibrary(args.index)
+    try:
+        if args.command == 'scan':
+            updated, removed, errors = library.scan(args.directories, args.workers)
+            print(f"Índice atualizado: {updated} casos lidos, {removed} removidos, {len(errors)} erros.")
+        elif args.title:
+            for path, title, n_buses, n_branches in library.find_by_title(args.title):
+                print(f"{path} | {title} | {n_buses} barras, {n_branches} ramos")
+        else:
+            for path, title, number, name, area in library.find_by_bus(args.bus, args.name):
+                print(f"{path} | {title} | Barra {number} - {name} (área {area})")
+    finally:
+        library.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# continuation.py
+import numpy as np
+import scipy.sparse as sparse
+from scipy.sparse.linalg import splu
+from power_system_model import PowerSystem
+import solvers
+
+class ContinuationResult:
+    """ Curvas PV traçadas pelo fluxo de potência continuado. """
+    def __init__(self, monitored_buses):
+        self.monitored_buses = list(monitored_buses)
+        self.lambdas = []
+        self.voltages = {bus_num: [] for bus_num in self.monitored_buses}
+        self.nose_index = None
+        self.factorizations = 0
+        self.log = ""
+
+    @property
+    def nose_lambda(self):
+        if self.nose_index is None:
+            return max(self.lambdas) if self.lambdas else 0.0
+        return self.lambdas[self.nose_index]
+
+    def add_point(self, lam, V, bus_map):
+        self.lambdas.append(float(lam))
+        for bus_num in self.monitored_buses:
+            self.voltages[bus_num].append(float(np.abs(V[bus_map[bus_num]])))
+
+def get_default_direction(system: PowerSystem, bus_map):
+    """
+    Direção padrão de crescimento: carga e geração de todas as barras
+    escaladas na proporção do caso base (injeções líquidas em pu).
+    """
+    return solvers.get_bus_injections(system, bus_map)
+
+def get_load_increase(system: PowerSystem, bus_map, direction=None):
+    """
+    Aumento de carga ativa (MW) por unidade de λ: a carga do caso base na
+    direção padrão, ou a soma dos incrementos de consumo (injeção líquida
+    negativa) de uma direção informada.
+    """
+    if direction is None:
+        return sum(system.buses[bus_num].p_load for bus_num in bus_map)
+    return sum(-complex(delta).real for bus_num, delta in direction.items()
+               if bus_num in bus_map and complex(delta).real < 0)
+
+def get_direction_vector(direction, bus_map):
+    """ Converte {barra: incremento de injeção líquida em MVA (P + jQ)} em vetor pu. """
+    s_dir = np.zeros(len(bus_map), dtype=complex)
+    for bus_num, delta in direction.items():
+        if bus_num in bus_map:
+            s_dir[bus_map[bus_num]] = complex(delta) / solvers.BASE_MVA
+    return s_dir
+
+def _augmented_matrix(ybus, V, d, pvpq, pq, k):
+    """
+    Jacobiana aumentada do fluxo continuado:
+    [ J   -d  ]
+    [   e_k   ]  (parametrização local na variável k)
+    """
+    jac = solvers.build_jacobian(ybus, V, pvpq, pq)
+    n = jac.shape[0]
+    col = sparse.csc_matrix(-d.reshape(-1, 1))
+    row = sparse.csr_matrix(([1.0], ([0], [k])), shape=(1, n + 1))
+    return sparse.vstack([sparse.hstack([jac, col]), row], format='csc')
+
+def run_continuation(system: PowerSystem, ybus, bus_map, direction=None, monitored_buses=None,
+                     v0=None, initial_step=0.1, min_step=1e-4, max_step=1.0, max_steps=200,
+                     tolerance=1e-5, max_corrector_iter=10, post_nose_ratio=0.8, reuse_distance=0.2):
+    """
+    Fluxo de potência continuado (preditor-corretor) para traçar curvas PV.
+
+    As injeções seguem S(λ) = S0 + λ * Sd, com Sd dado por direction
+    ({barra: MVA}) ou, por padrão, proporcional ao caso base. O passo é
+    adaptativo e a parametrização local troca de λ para a tensão mais
+    sensível perto do ponto de máximo carregamento, o que permite passar
+    do "nariz" da curva.
+
+    A fatoração da Jacobiana aumentada é reaproveitada entre o preditor e
+    o corretor (método da corda) e entre passos; só é refeita quando o
+    corretor estagna ou fica lento, quando a variável de parametrização
+    muda ou quando o ponto se afasta mais de reuse_distance (máximo entre ângulos em rad,
+    tensões em pu e λ) de onde a fatoração foi feita.
+    """
+    log = "Iniciando Fluxo de Potência Continuado...\n"
+    print(log.strip())
+
+    ref, pv, pq = solvers.get_bus_types(system, bus_map)
+    pvpq = np.r_[pv, pq]
+    n_pvpq = len(pvpq)
+    n = n_pvpq + len(pq)
+
+    if monitored_buses is None:
+        monitored_buses = [bus_num for bus_num, idx in sorted(bus_map.items()) if idx in set(pq)]
+    result = ContinuationResult(b for b in monitored_buses if b in bus_map)
+
+    # 1. Caso base
+    if not solvers.solve_newton_raphson(system, ybus, bus_map, tolerance=tolerance, v0=v0):
+        result.log = log + system.log + "Caso base não convergiu. Continuação abortada.\n"
+        return result
+    V = solvers.get_result_voltage(system, bus_map)
+
+    s_spec = solvers.get_bus_injections(system, bus_map)
+    s_dir = get_default_direction(system, bus_map) if direction is None else get_direction_vector(direction, bus_map)
+    d = np.r_[s_dir.real[pvpq], s_dir.imag[pq]]
+    if not np.any(d):
+        result.log = log + "Direção de crescimento nula. Continuação abortada.\n"
+        return result
+
+    def to_voltage(x):
+        va = np.angle(V_template).copy()
+        vm = np.abs(V_template).copy()
+        va[pvpq] = x[:n_pvpq]
+        vm[pq] = x[n_pvpq:n]
+        return vm * np.exp(1j * va)
+
+    def mismatch(x):
+        Vx = to_voltage(x)
+        mis = Vx * np.conj(ybus @ Vx) - (s_spec + x[n] * s_dir)
+        return np.r_[mis.real[pvpq], mis.imag[pq]]
+
+    V_template = V
+    x = np.r_[np.angle(V)[pvpq], np.abs(V)[pq], 0.0]
+    result.add_point(0.0, V, bus_map)
+
+    k = n # Começa parametrizando em λ
+    lu = splu(_augmented_matrix(ybus, V, d, pvpq, pq, k))
+    lu_k = k
+    lu_x = x.copy() # Ponto em que a fatoração atual foi feita
+    result.factorizations += 1
+    t_prev = None
+    step = initial_step
+    lambda_max = 0.0
+    passed_nose = False
+
+    for step_count in range(max_steps):
+        # 2. Preditor (vetor tangente com a fatoração atual)
+        rhs = np.zeros(n + 1)
+        rhs[-1] = 1.0
+        t = lu.solve(rhs)
+        t /= np.linalg.norm(t)
+        if (t_prev is None and t[n] < 0) or (t_prev is not None and np.dot(t, t_prev) < 0):
+            t = -t
+
+        # Parametrização local: variável de maior variação na tangente
+        k = int(np.argmax(np.abs(t)))
+        if k != lu_k:
+            lu = splu(_augmented_matrix(ybus, to_voltage(x), d, pvpq, pq, k))
+            lu_k = k
+            lu_x = x.copy()
+            result.factorizations += 1
+
+        # 3. Corretor (corda com a fatoração do preditor; refatora se estagnar)
+        while True:
+            x_pred = x + step * t
+            x_new = x_pred.copy()
+            lu_corr, lu_corr_x = lu, lu_x
+            refactored = False
+            converged = False
+            prev_norm = np.inf
+            for it in range(max_corrector_iter):
+                f = np.r_[mismatch(x_new), x_new[k] - x_pred[k]]
+                norm = np.max(np.abs(f))
+                if norm < tolerance:
+                    converged = True
+                    break
+                if norm > 0.5 * prev_norm and not refactored:
+                    lu_corr = splu(_augmented_matrix(ybus, to_voltage(x_new), d, pvpq, pq, k))
+                    lu_corr_x = x_new.copy()
+                    result.factorizations += 1
+                    refactored = True
+                prev_norm = norm
+                x_new += lu_corr.solve(-f)
+
+            if converged:
+                break
+            step /= 2.0
+            if step < min_step:
+                break
+            # Passo rejeitado: refatora no último ponto aceito antes de tentar de novo
+            lu = splu(_augmented_matrix(ybus, to_voltage(x), d, pvpq, pq, k))
+            lu_x = x.copy()
+            result.factorizations += 1
+
+        if not converged:
+            log += f"Passo {step_count + 1}: corretor não convergiu com passo mínimo. Encerrando.\n"
+            break
+
+        # 4. Aceita o ponto e ajusta o passo
+        x = x_new
+        t_prev = t
+        V_point = to_voltage(x)
+        result.add_point(x[n], V_point, bus_map)
+        log += f"Passo {step_count + 1}: λ = {x[n]:.5f}, passo = {step:.4f}, iterações do corretor = {it}\n"
+
+        if x[n] > lambda_max:
+            lambda_max = x[n]
+        elif not passed_nose:
+            passed_nose = True
+            result.nose_index = int(np.argmax(result.lambdas))
+            log += f"Ponto de máximo carregamento ultrapassado (λ máx = {lambda_max:.5f}).\n"
+
+        # O método da corda converge linearmente: limites mais folgados que no Newton
+        if it <= 3:
+            step = min(step * 1.5, max_step)
+        elif it > 6:
+            step = max(step / 1.5, min_step)
+
+        # Se o corretor estagnou, a fatoração nova dele passa a ser a atual;
+        # senão só refatora se o corretor ficou lento ou o ponto se afastou
+        # da última fatoração
+        if refactored:
+            lu, lu_x = lu_corr, lu_corr_x
+        elif it > 5 or np.max(np.abs(x - lu_x)) > reuse_distance:
+            lu = splu(_augmented_matrix(ybus, V_point, d, pvpq, pq, k))
+            lu_x = x.copy()
+            result.factorizations += 1
+
+        if passed_nose and x[n] < post_nose_ratio * lambda_max:
+            break
+        if x[n] < 0:
+            break
+
+    if result.nose_index is None and result.lambdas:
+        result.nose_index = int(np.argmax(result.lambdas))
+
+    margin = result.nose_lambda * get_load_increase(system, bus_map, direction)
+    log += (f"Continuação concluída: {len(result.lambdas)} pontos, "
+            f"{result.factorizations} fatorações.\n")
+    log += f"Margem de carregamento: λ = {result.nose_lambda:.5f} (+{margin:.2f} MW de carga na direção escolhida).\n"
+    result.log = log
+    system.log = log
+    return result
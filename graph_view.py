@@ -1,17 +1,51 @@
 # graph_view.py
+import numpy as np
 import networkx as nx
 from PyQt6.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsRectItem, 
                              QGraphicsLineItem, QGraphicsTextItem, QGraphicsSimpleTextItem,
                              QGraphicsItem, QMenu, QDialog, QVBoxLayout, 
                              QLabel, QDialogButtonBox)
-from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtCore import Qt, QPointF, QTimer
 from PyQt6.QtGui import QColor, QBrush, QPen
 from power_system_model import PowerSystem, Bus, Branch
+from post_processing import BranchFlows
 
 BUS_COLOR = QColor("#42a5f5")
 BUS_COLOR_REF = QColor("#f44336")
 BUS_COLOR_PV = QColor("#66bb6a")
 LINE_COLOR = QColor("#9e9e9e")
+LINE_COLOR_LIGHT = QColor("#66bb6a") # Carregamento < 80%
+LINE_COLOR_HEAVY = QColor("#ffa726") # Carregamento entre 80% e 100%
+LINE_COLOR_OVERLOAD = QColor("#e53935") # Sobrecarga (> 100%)
+COMPARE_COLOR_CHANGED = QColor("#ff8f00") # Alterado na comparação de casos
+COMPARE_COLOR_MISSING = QColor("#9e9e9e") # Ausente no outro caso
+
+# Sobreposição de convergência
+OVERLAY_FPS = 10 # Taxa máxima de atualização da cena durante o cálculo
+OVERLAY_LEVELS = 16 # Nº de faixas de cor (só muda o pincel quando a faixa muda)
+OVERLAY_V_RANGE = (0.90, 1.10) # Faixa de tensão (pu) da escala de cores
+OVERLAY_MISMATCH_RANGE = (-6.0, 0.0) # log10 do mismatch (pu)
+
+def _build_overlay_brushes(start, middle, end):
+    """ Escala de cores em OVERLAY_LEVELS pincéis (start -> middle -> end). """
+    brushes = []
+    for i in range(OVERLAY_LEVELS):
+        t = 2 * i / (OVERLAY_LEVELS - 1)
+        c0, c1 = (start, middle) if t <= 1 else (middle, end)
+        t = t if t <= 1 else t - 1
+        rgb = [int(a + (b - a) * t) for a, b in zip(c0, c1)]
+        brushes.append(QBrush(QColor(*rgb)))
+    return brushes
+
+def get_loading_color(loading):
+    """ Cor do ramo em função do carregamento (%). """
+    if loading is None:
+        return LINE_COLOR
+    if loading > 100:
+        return LINE_COLOR_OVERLOAD
+    if loading >= 80:
+        return LINE_COLOR_HEAVY
+    return LINE_COLOR_LIGHT
 
 class InfoPanel(QDialog):
     """ Painel flutuante que mostra informações do item. """
@@ -49,6 +83,12 @@ class InfoPanel(QDialog):
         layout.addWidget(QLabel(f"Shunt (B): {branch.shunt_b} pu"))
         if branch.is_transformer:
             layout.addWidget(QLabel(f"Tap: {branch.tap}"))
+        if branch.p_from is not None:
+            layout.addWidget(QLabel(f"Fluxo De: {branch.p_from:.2f} MW / {branch.q_from:.2f} MVAr"))
+            layout.addWidget(QLabel(f"Fluxo Para: {branch.p_to:.2f} MW / {branch.q_to:.2f} MVAr"))
+            layout.addWidget(QLabel(f"Perdas: {branch.p_loss:.3f} MW / {branch.q_loss:.3f} MVAr"))
+        if branch.loading is not None:
+            layout.addWidget(QLabel(f"Carregamento: {branch.loading:.1f}% de {branch.rating_normal} MVA"))
 
 
 class BranchItem(QGraphicsLineItem):
@@ -64,6 +104,12 @@ class BranchItem(QGraphicsLineItem):
         self.setZValue(-1) # Envia para trás das barras
         self.update_position()
 
+    def update_loading(self):
+        """ Colore o ramo de acordo com o carregamento calculado. """
+        pen = self.pen()
+        pen.setColor(get_loading_color(self.branch.loading))
+        self.setPen(pen)
+
     def update_position(self):
         # --- CORREÇÃO AQUI ---
         # A função setLine espera 4 floats (x1, y1, x2, y2)
@@ -91,7 +137,9 @@ class BusItem(QGraphicsRectItem):
         else: # PQ
             color = BUS_COLOR
         
-        self.setBrush(QBrush(color))
+        self.base_brush = QBrush(color)
+        self.overlay_level = None
+        self.setBrush(self.base_brush)
         self.setPen(QPen(Qt.GlobalColor.black, 1))
         
         # Flags
@@ -122,39 +170,60 @@ class InteractiveGraphView(QGraphicsView):
         self.setScene(self.scene)
         self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
         self.setRenderHint(self.renderHints().Antialiasing)
+        self.system = None
         self.bus_items = {} # {bus_number: BusItem}
         self.branch_items = {} # {branch_id: BranchItem}
         self.info_panel = None
+
+        # Sobreposição de convergência ('voltage', 'mismatch' ou None)
+        self.overlay_mode = None
+        self._overlay_brushes = {
+            # Tensão: baixa (vermelho) -> nominal (verde) -> alta (azul)
+            'voltage': _build_overlay_brushes((229, 57, 53), (102, 187, 106), (66, 165, 245)),
+            # Mismatch: pequeno (verde) -> médio (amarelo) -> grande (vermelho)
+            'mismatch': _build_overlay_brushes((102, 187, 106), (255, 235, 59), (229, 57, 53)),
+        }
+        self._overlay_items = None
+        self._overlay_flows = None
+        self._overlay_pending = None
+        self._overlay_timer = QTimer(self)
+        self._overlay_timer.setInterval(1000 // OVERLAY_FPS)
+        self._overlay_timer.timeout.connect(self._flush_overlay)
         
         self.scene.selectionChanged.connect(self.on_selection_changed)
 
     def clear_system(self):
+        self._overlay_pending = None
+        self.end_overlay()
         self.scene.clear()
         self.bus_items.clear()
         self.branch_items.clear()
 
     def draw_system(self, system: PowerSystem):
         self.clear_system()
+        self.system = system
         
         if not system.buses:
             return
 
-        # 1. Usar NetworkX para calcular um layout inicial
-        G = nx.Graph()
-        G.add_nodes_from(system.buses.keys())
-        G.add_edges_from([(br.from_bus, br.to_bus) for br in system.branches.values()])
-        
-        # Layout de mola: dá posições iniciais para evitar sobreposição
-        pos = nx.spring_layout(G, k=1.5, iterations=50, seed=42)
+        # 1. Usar NetworkX para calcular um layout inicial (se ainda não houver)
+        if any(bus_num not in system.layout for bus_num in system.buses):
+            G = nx.Graph()
+            G.add_nodes_from(system.buses.keys())
+            G.add_edges_from([(br.from_bus, br.to_bus) for br in system.branches.values()])
+
+            # Layout de mola: dá posições iniciais para evitar sobreposição
+            pos = nx.spring_layout(G, k=1.5, iterations=50, seed=42)
+            for bus_num in system.buses:
+                if bus_num not in system.layout:
+                    # Escala o layout para o tamanho da cena (barra isolada fica na origem)
+                    x, y = pos[bus_num] if bus_num in pos else (0.0, 0.0)
+                    system.layout[bus_num] = (float(x) * 500, float(y) * 500)
 
         # 2. Adicionar Barras (BusItem) à cena
         for bus_num, bus in system.buses.items():
             item = BusItem(bus)
-            if bus_num in pos:
-                # Escala o layout para o tamanho da cena
-                item.setPos(pos[bus_num][0] * 500, pos[bus_num][1] * 500)
-            else:
-                item.setPos(0, 0) # Posição padrão se for barra isolada
+            item.setPos(*system.layout[bus_num])
             self.scene.addItem(item)
             self.bus_items[bus_num] = item
 
@@ -171,6 +240,121 @@ class InteractiveGraphView(QGraphicsView):
         
         self.centerOn(self.bus_items[list(system.buses.keys())[0]])
 
+    def mouseReleaseEvent(self, event):
+        """ Registra no diário as barras arrastadas (desfazer/refazer). """
+        super().mouseReleaseEvent(event)
+        if not self.system:
+            return
+        for item in self.scene.selectedItems():
+            if isinstance(item, BusItem):
+                position = (item.pos().x(), item.pos().y())
+                if position != self.system.layout.get(item.bus.number):
+                    self.system.edit('layout', item.bus.number, 'position', position)
+
+    def refresh_edit(self, edit):
+        """ Reflete no desenho uma alteração desfeita/refeita. """
+        if edit.target == 'layout' and edit.key in self.bus_items:
+            self.bus_items[edit.key].setPos(*self.system.layout[edit.key])
+
+    def highlight_comparison(self, changed_buses, changed_branches, missing_buses, missing_branches):
+        """ Contorna as barras e engrossa os ramos alterados/ausentes na comparação. """
+        self.clear_comparison()
+        for items, changed, missing in ((self.bus_items, changed_buses, missing_buses),
+                                        (self.branch_items, changed_branches, missing_branches)):
+            for key, color in [(k, COMPARE_COLOR_CHANGED) for k in changed] + \
+                              [(k, COMPARE_COLOR_MISSING) for k in missing]:
+                item = items.get(key)
+                if item is None:
+                    continue
+                pen = item.pen()
+                pen.setColor(color)
+                pen.setWidth(4)
+                item.setPen(pen)
+
+    def clear_comparison(self):
+        """ Remove os destaques de comparação. """
+        for item in self.bus_items.values():
+            item.setPen(QPen(Qt.GlobalColor.black, 1))
+        for item in self.branch_items.values():
+            pen = item.pen()
+            pen.setWidth(2)
+            item.setPen(pen)
+            item.update_loading()
+
+    def update_results(self):
+        """ Atualiza as cores dos ramos após um cálculo. """
+        for item in self.branch_items.values():
+            item.update_loading()
+
+    def begin_overlay(self, system: PowerSystem, bus_map):
+        """
+        Prepara a sobreposição de convergência para um cálculo. Os dados de
+        cada iteração chegam por push_iteration() (pode ser outra thread) e
+        só o estado mais recente é aplicado, no máximo OVERLAY_FPS vezes/s.
+        """
+        self._overlay_pending = None
+        if not self.overlay_mode:
+            return
+
+        # Itens na ordem do bus_map, para aplicar os vetores do solver direto
+        order = sorted(bus_map, key=bus_map.get)
+        self._overlay_items = [self.bus_items.get(bus_num) for bus_num in order]
+        self._overlay_flows = BranchFlows(system, bus_map)
+        self._overlay_timer.start()
+
+    def push_iteration(self, k, V, mismatch):
+        """ Callback do solver: só guarda a referência (custo desprezível). """
+        self._overlay_pending = (V, mismatch)
+
+    def end_overlay(self):
+        """ Aplica o último estado pendente e para o temporizador. """
+        self._overlay_timer.stop()
+        self._flush_overlay()
+        self._overlay_items = None
+        self._overlay_flows = None
+
+    def reset_overlay(self):
+        """ Volta às cores por tipo de barra. """
+        for item in self.bus_items.values():
+            item.overlay_level = None
+            item.setBrush(item.base_brush)
+
+    def _flush_overlay(self):
+        pending, self._overlay_pending = self._overlay_pending, None
+        if pending is None or self._overlay_items is None:
+            return
+        V, mismatch = pending
+
+        if self.overlay_mode == 'voltage':
+            lo, hi = OVERLAY_V_RANGE
+            values = np.abs(V)
+        else:
+            lo, hi = OVERLAY_MISMATCH_RANGE
+            values = np.log10(np.abs(mismatch) + 1e-12)
+        levels = np.clip(((values - lo) / (hi - lo) * (OVERLAY_LEVELS - 1)).round(), 0, OVERLAY_LEVELS - 1)
+        levels = levels.astype(int)
+        brushes = self._overlay_brushes[self.overlay_mode]
+
+        # Carregamento dos ramos com o V atual (só no quadro, não no solver)
+        _, _, _, loading = self._overlay_flows.compute(V)
+
+        # Aplica todas as mudanças em lote e repinta a vista uma única vez
+        self.viewport().setUpdatesEnabled(False)
+        for item, level in zip(self._overlay_items, levels):
+            if item is not None and item.overlay_level != level:
+                item.overlay_level = level
+                item.setBrush(brushes[level])
+        for br_id, value in zip(self._overlay_flows.branch_ids, loading):
+            item = self.branch_items.get(br_id)
+            if item is not None:
+                color = get_loading_color(None if np.isnan(value) else value)
+                if item.pen().color() != color:
+                    pen = item.pen()
+                    pen.setColor(color)
+                    item.setPen(pen)
+        self.viewport().setUpdatesEnabled(True)
+        self.viewport().update()
+
     def on_selection_changed(self):
         """ Mostra o painel flutuante quando um item é selecionado. """
         selected = self.scene.selectedItems()
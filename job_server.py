@@ -0,0 +1,242 @@
+# job_server.py
+"""
+Servidor local de fluxo de potência.
+
+Carrega os casos .PWF uma única vez e os mantém em memória, recebendo
+trabalhos (solve, contingência, cenários) de vários clientes via JSON
+sobre HTTP (TCP ou socket Unix). Os trabalhos são distribuídos para um
+pool de processos que já recebem os casos carregados na inicialização.
+Um caso registrado depois (POST /cases) também é lido uma única vez, no
+servidor; o pool é então recriado com todos os casos (os trabalhos em
+andamento terminam no pool anterior).
+
+Uso:
+    python job_server.py CASO1.PWF [CASO2.PWF ...] [--port 8765] [--socket /tmp/fluxy.sock]
+
+Rotas:
+    GET  /cases              Lista os casos carregados
+    POST /cases              {"path": "...", "name": "..."} carrega um novo caso
+    POST /jobs/solve         {"case": "...", "changes": {...}}
+    POST /jobs/contingency   {"case": "...", "outages": ["27-3383-1", ["458-459-1", "458-459-2"]]}
+    POST /jobs/scenario      {"case": "...", "scenarios": [{"name": "...", "changes": {...}}]}
+
+Formato de "changes":
+    {"buses": {"454": {"p_load": 700.0}}, "branches": {"27-3383-1": {"status": false}}}
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from power_system_model import PowerSystem
+from pwf_parser import parse_pwf_file
+from post_processing import compute_branch_flows
+import solvers
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+# --- Lado do processo de trabalho ---
+
+_worker_cases = {} # {nome: PowerSystem} residentes no processo
+_worker_base_voltages = {} # {nome: (bus_map, V)} do caso base, para partida a quente
+
+def _worker_init(cases):
+    _worker_cases.update(cases)
+
+def _get_base_voltage(name, base):
+    if name not in _worker_base_voltages:
+        system = copy.deepcopy(base)
+        ybus, bus_map = solvers.build_ybus(system)
+        V = None
+        if solvers.solve_newton_raphson(system, ybus, bus_map):
+            V = solvers.get_result_voltage(system, bus_map)
+        _worker_base_voltages[name] = (bus_map, V)
+    return _worker_base_voltages[name]
+
+def _solve_job(name, changes, label=None):
+    """ Resolve uma cópia do caso com as alterações pedidas e resume o resultado. """
+    base = _worker_cases[name]
+    system = copy.deepcopy(base)
+    system.apply_changes(changes)
+
+    ybus, bus_map = solvers.build_ybus(system)
+    base_map, v_base = _get_base_voltage(name, base)
+    v0 = v_base if v_base is not None and bus_map == base_map else None
+    converged = solvers.solve_newton_raphson(system, ybus, bus_map, v0=v0)
+
+    result = {'label': label, 'converged': converged, 'log': system.log}
+    if not converged:
+        return result
+
+    losses = compute_branch_flows(system, bus_map)
+    result['losses'] = [losses.real, losses.imag]
+    result['buses'] = {str(num): [bus.v_result, bus.angle_result]
+                       for num, bus in system.buses.items() if bus.v_result is not None}
+    result['branches'] = {br_id: [br.p_from, br.q_from, br.p_to, br.q_to, br.loading]
+                          for br_id, br in system.branches.items() if br.p_from is not None}
+    result['min_voltage'] = min((v for v, _ in result['buses'].values()), default=None)
+    result['overloads'] = [br_id for br_id, br in system.branches.items()
+                           if br.loading is not None and br.loading > 100]
+    return result
+
+# --- Lado do servidor ---
+
+def load_case(path):
+    system = PowerSystem()
+    system.load_from_pwf(parse_pwf_file(path))
+    return system
+
+class JobServer:
+    """ Mantém os casos residentes e despacha os trabalhos para o pool. """
+    def __init__(self, case_paths, n_workers=None):
+        self.cases = {} # {nome: caminho}
+        self.systems = {} # {nome: PowerSystem} lidos uma única vez
+        self.n_workers = n_workers
+        for path in case_paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            self.cases[name] = path
+            self.systems[name] = load_case(path)
+        self.pool = self._start_pool()
+
+    def _start_pool(self):
+        """ Pool de processos que já recebem todos os casos carregados. """
+        return ProcessPoolExecutor(max_workers=self.n_workers, initializer=_worker_init,
+                                   initargs=(self.systems,))
+
+    async def _run(self, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, _solve_job, *args)
+
+    async def _run_variant(self, name, changes, label):
+        """ Como _run, mas uma variante com erro não derruba o lote inteiro. """
+        try:
+            return await self._run(name, changes, label)
+        except Exception as e:
+            return {'label': label, 'converged': False, 'erro': str(e)}
+
+    def _case_name(self, request):
+        name = request.get('case')
+        if name not in self.cases:
+            raise LookupError(f"Caso não carregado: {name}")
+        return name
+
+    async def handle(self, method, route, request):
+        if method == 'GET' and route == '/cases':
+            return {'cases': sorted(self.cases)}
+
+        if method == 'POST' and route == '/cases':
+            path = request.get('path')
+            if not path:
+                raise ValueError("Campo obrigatório ausente: path")
+            name = request.get('name') or os.path.splitext(os.path.basename(path))[0]
+            if not os.path.isfile(path):
+                raise LookupError(f"Arquivo não encontrado: {path}")
+            # Os processos guardam o caso (e sua solução base) pelo nome:
+            # trocar o arquivo de um nome já registrado serviria dados antigos
+            if name in self.cases and os.path.abspath(self.cases[name]) != os.path.abspath(path):
+                raise ValueError(f"O caso '{name}' já está carregado de outro arquivo: {self.cases[name]}")
+            if name not in self.cases:
+                # Lido uma vez aqui (fora do laço de eventos) e enviado aos processos
+                loop = asyncio.get_running_loop()
+                self.systems[name] = await loop.run_in_executor(None, load_case, path)
+                self.cases[name] = path
+                old_pool, self.pool = self.pool, self._start_pool()
+                old_pool.shutdown(wait=False)
+            return {'case': name}
+
+        if method == 'POST' and route == '/jobs/solve':
+            name = self._case_name(request)
+            return await self._run(name, request.get('changes'))
+
+        if method == 'POST' and route == '/jobs/contingency':
+            name = self._case_name(request)
+            jobs = []
+            for outage in request.get('outages', []):
+                branch_ids = [outage] if isinstance(outage, str) else list(outage)
+                changes = {'branches': {br_id: {'status': False} for br_id in branch_ids}}
+                jobs.append(self._run_variant(name, changes, '+'.join(branch_ids)))
+            return {'results': await asyncio.gather(*jobs)}
+
+        if method == 'POST' and route == '/jobs/scenario':
+            name = self._case_name(request)
+            jobs = [self._run_variant(name, scenario.get('changes'), scenario.get('name', str(i)))
+                    for i, scenario in enumerate(request.get('scenarios', []))]
+            return {'results': await asyncio.gather(*jobs)}
+
+        raise LookupError(f"Rota desconhecida: {method} {route}")
+
+    async def handle_connection(self, reader, writer):
+        """ Atende uma requisição HTTP/1.1 simples com corpo JSON. """
+        status = 200
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            if len(request_line) < 2:
+                raise ValueError("Linha de requisição malformada.")
+            method, route = request_line[0].upper(), request_line[1]
+
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            body = await reader.readexactly(length) if length else b''
+            request = json.loads(body) if body else {}
+            if not isinstance(request, dict):
+                raise ValueError("O corpo da requisição deve ser um objeto JSON.")
+            response = await self.handle(method, route, request)
+        except LookupError as e:
+            status, response = 404, {'erro': e.args[0] if e.args else str(e)}
+        except (ValueError, json.JSONDecodeError) as e:
+            status, response = 400, {'erro': str(e)}
+        except Exception as e:
+            status, response = 500, {'erro': str(e)}
+
+        payload = json.dumps(response, ensure_ascii=False).encode('utf-8')
+        try:
+            writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                         f"Content-Type: application/json; charset=utf-8\r\n"
+                         f"Content-Length: {len(payload)}\r\n"
+                         f"Connection: close\r\n\r\n".encode('latin-1') + payload)
+            await writer.drain()
+        except ConnectionError:
+            pass # Cliente desconectou antes da resposta
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, socket_path=None):
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+            print(f"Servidor ouvindo em unix:{socket_path}")
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            print(f"Servidor ouvindo em http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de fluxo de potência.")
+    parser.add_argument('cases', nargs='*', help="Arquivos .PWF carregados na inicialização")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', help="Caminho de socket Unix (substitui host/porta)")
+    parser.add_argument('--workers', type=int, default=None, help="Número de processos de trabalho")
+    args = parser.parse_args()
+
+    server = JobServer(args.cases, args.workers)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        print("Servidor encerrado.")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,22 @@
 # mainwindow.py
+import threading
 from PyQt6.QtWidgets import (QMainWindow, QToolBar, QFileDialog, QDockWidget, 
-                             QTextEdit, QStatusBar, QMessageBox, QToolButton, QMenu)
-from PyQt6.QtGui import QAction, QIcon
-from PyQt6.QtCore import Qt, QSize
-from power_system_model import PowerSystem
+                             QTextEdit, QStatusBar, QMessageBox, QToolButton, QMenu,
+                             QInputDialog, QApplication)
+from PyQt6.QtGui import QAction, QIcon, QKeySequence
+from PyQt6.QtCore import Qt, QSize, QEventLoop
+from power_system_model import PowerSystem, INVALIDATES_TOPOLOGY, INVALIDATES_YBUS, INVALIDATES_LAYOUT
 from pwf_parser import parse_pwf_file
 from graph_view import InteractiveGraphView
 from parameters_panel import ParametersPanel
+from network_reduction import reduce_network
+from solution_cache import SolutionCache
+from continuation import run_continuation
+from time_series import load_profiles_csv, run_time_series
+from post_processing import compute_branch_flows
+from sensitivity import SensitivityAnalyzer
+from pwf_writer import write_pwf
+from case_comparison import CaseArrays, compare_cases
 import solvers
 
 class MainWindow(QMainWindow):
@@ -16,7 +26,16 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
 
         self.system = None
+        self.network = None # (ybus, bus_map) da rede completa, reaproveitada entre cálculos
+        self.equivalent = None # Equivalente de rede ativo (rede parcial)
+        self.equivalent_selection = None # (barras, áreas) usadas no equivalente
+        self.sensitivity = None # SensitivityAnalyzer do último ponto de operação
+        self.solution_cache = SolutionCache()
+        self.last_solution = None # CaseArrays do último cálculo (para comparação)
+        self.previous_solution = None # CaseArrays do cálculo anterior a ele
         self.current_solver = 'newton' # Solver padrão
+        self.helm_terms = 60 # Comprimento máximo das séries do HELM
+        self.helm_tolerance = 1e-5 # Tolerância de mismatch do HELM (pu)
 
         # Widget Central (Gráfico)
         self.graph_view = InteractiveGraphView(self)
@@ -40,11 +59,13 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Pronto. Abra um arquivo .PWF para começar.")
+        self.params_panel.message.connect(self.status_bar.showMessage)
 
     def setup_toolbar(self):
         toolbar = QToolBar("Ferramentas")
         toolbar.setIconSize(QSize(24, 24))
         self.addToolBar(toolbar)
+        self.toolbar = toolbar
 
         # --- Ação: Abrir Arquivo ---
         action_open = QAction("Abrir arquivo", self)
@@ -52,6 +73,25 @@ class MainWindow(QMainWindow):
         action_open.triggered.connect(self.open_file)
         toolbar.addAction(action_open)
 
+        # --- Ação: Salvar Arquivo ---
+        action_save = QAction("Salvar PWF", self)
+        action_save.setStatusTip("Salvar o sistema (com resultados) em formato ANAREDE (.PWF)")
+        action_save.triggered.connect(self.save_file)
+        toolbar.addAction(action_save)
+
+        # --- Ações: Desfazer / Refazer ---
+        action_undo = QAction("Desfazer", self)
+        action_undo.setShortcut(QKeySequence.StandardKey.Undo)
+        action_undo.setStatusTip("Desfazer a última alteração nos dados ou no desenho")
+        action_undo.triggered.connect(self.undo_edit)
+        toolbar.addAction(action_undo)
+
+        action_redo = QAction("Refazer", self)
+        action_redo.setShortcut(QKeySequence.StandardKey.Redo)
+        action_redo.setStatusTip("Refazer a última alteração desfeita")
+        action_redo.triggered.connect(self.redo_edit)
+        toolbar.addAction(action_redo)
+
         toolbar.addSeparator()
 
         # --- Ação: Escolher Solver ---
@@ -72,8 +112,29 @@ class MainWindow(QMainWindow):
         action_g.triggered.connect(lambda: self.set_solver('gauss_jacobi', 'Gauss (Jacobi)'))
         solver_menu.addAction(action_g)
 
+        action_helm = QAction("HELM (Imersão Holomórfica)", self)
+        action_helm.triggered.connect(lambda: self.set_solver('helm', 'HELM'))
+        solver_menu.addAction(action_helm)
+
+        solver_menu.addSeparator()
+        action_helm_config = QAction("Configurar HELM...", self)
+        action_helm_config.triggered.connect(self.configure_helm)
+        solver_menu.addAction(action_helm_config)
+
         self.solver_button.setMenu(solver_menu)
         toolbar.addWidget(self.solver_button)
+
+        # --- Ação: Sobreposição de convergência ---
+        self.overlay_button = QToolButton()
+        self.overlay_button.setText("Sobreposição: Desligada")
+        self.overlay_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        overlay_menu = QMenu(self)
+        for mode, name in ((None, "Desligada"), ('voltage', "Tensão"), ('mismatch', "Mismatch")):
+            action = QAction(name, self)
+            action.triggered.connect(lambda _, m=mode, n=name: self.set_overlay(m, n))
+            overlay_menu.addAction(action)
+        self.overlay_button.setMenu(overlay_menu)
+        toolbar.addWidget(self.overlay_button)
         
         # --- Ação: Parâmetros ---
         action_params = QAction("Parâmetros", self)
@@ -81,12 +142,42 @@ class MainWindow(QMainWindow):
         action_params.triggered.connect(self.toggle_parameters_panel)
         toolbar.addAction(action_params)
 
+        # --- Ação: Equivalente de Rede ---
+        action_equiv = QAction("Equivalente", self)
+        action_equiv.setStatusTip("Reduzir a rede às barras/áreas de estudo (Kron/Ward)")
+        action_equiv.triggered.connect(self.define_equivalent)
+        toolbar.addAction(action_equiv)
+
         # --- Ação: Calcular ---
-        action_calc = QAction("Calcular", self)
-        action_calc.setStatusTip("Executar cálculo de fluxo de potência")
-        action_calc.triggered.connect(self.run_calculation)
-        toolbar.addAction(action_calc)
+        self.action_calc = QAction("Calcular", self)
+        self.action_calc.setStatusTip("Executar cálculo de fluxo de potência")
+        self.action_calc.triggered.connect(self.run_calculation)
+        toolbar.addAction(self.action_calc)
         
+        # --- Ação: Curva PV ---
+        action_pv = QAction("Curva PV", self)
+        action_pv.setStatusTip("Fluxo de potência continuado (margem de estabilidade de tensão)")
+        action_pv.triggered.connect(self.run_pv_curve)
+        toolbar.addAction(action_pv)
+
+        # --- Ação: Sensibilidade ---
+        action_sens = QAction("Sensibilidade", self)
+        action_sens.setStatusTip("Sensibilidades dV/dQ no ponto de operação calculado")
+        action_sens.triggered.connect(self.run_sensitivity)
+        toolbar.addAction(action_sens)
+
+        # --- Ação: Série Temporal ---
+        action_ts = QAction("Série Temporal", self)
+        action_ts.setStatusTip("Simulação quase-estática com perfis de carga/geração (CSV)")
+        action_ts.triggered.connect(self.run_time_series)
+        toolbar.addAction(action_ts)
+
+        # --- Ação: Comparar Casos ---
+        action_compare = QAction("Comparar", self)
+        action_compare.setStatusTip("Comparar com outro caso .PWF ou com o cálculo anterior")
+        action_compare.triggered.connect(self.run_comparison)
+        toolbar.addAction(action_compare)
+
         # --- Ação: Log ---
         action_log = QAction("Log", self)
         action_log.setStatusTip("Mostrar/Esconder log de cálculo")
@@ -98,6 +189,63 @@ class MainWindow(QMainWindow):
         self.solver_button.setText(f"Solver: {solver_name}")
         self.status_bar.showMessage(f"Solver alterado para {solver_name}.")
 
+    def set_overlay(self, mode, name):
+        self.graph_view.overlay_mode = mode
+        self.overlay_button.setText(f"Sobreposição: {name}")
+        if mode is None:
+            self.graph_view.reset_overlay()
+        self.status_bar.showMessage(f"Sobreposição de convergência: {name}.")
+
+    def configure_helm(self):
+        terms, ok = QInputDialog.getInt(self, "Configurar HELM", "Nº máximo de termos da série:",
+                                        self.helm_terms, 4, 500)
+        if not ok:
+            return
+        tolerance, ok = QInputDialog.getDouble(self, "Configurar HELM", "Tolerância de mismatch (pu):",
+                                               self.helm_tolerance, 1e-12, 1.0, 12)
+        if not ok:
+            return
+        self.helm_terms, self.helm_tolerance = terms, tolerance
+        self.status_bar.showMessage(f"HELM: até {terms} termos, tolerância {tolerance:g} pu.")
+
+    def solve_with_overlay(self, solve, study_system, ybus, bus_map, **kwargs):
+        """
+        Executa o solver (Newton-Raphson ou HELM) em uma thread de trabalho
+        enquanto a interface continua respondendo. Cada iteração só entrega
+        (V, mismatch) à vista, que redesenha no seu próprio ritmo (OVERLAY_FPS).
+        """
+        outcome = {}
+        def worker():
+            try:
+                outcome['success'] = solve(study_system, ybus, bus_map,
+                                           callback=self.graph_view.push_iteration, **kwargs)
+            except Exception as e:
+                outcome['error'] = e
+
+        # Nada que altere o sistema (abrir, desfazer, editar tabelas,
+        # equivalente, outras análises...) pode rodar durante o cálculo
+        actions = [action for action in self.toolbar.actions() if action.isEnabled()]
+        for action in actions:
+            action.setEnabled(False)
+        self.params_panel.setEnabled(False)
+
+        self.graph_view.begin_overlay(study_system, bus_map)
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        try:
+            while thread.is_alive():
+                QApplication.processEvents()
+                thread.join(0.01)
+        finally:
+            for action in actions:
+                action.setEnabled(True)
+            self.params_panel.setEnabled(True)
+            self.graph_view.end_overlay()
+
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['success']
+
     def toggle_parameters_panel(self):
         if self.params_panel.isVisible():
             self.params_panel.hide()
@@ -114,6 +262,11 @@ class MainWindow(QMainWindow):
                 parsed_data = parse_pwf_file(filepath)
                 self.system = PowerSystem()
                 self.system.load_from_pwf(parsed_data)
+                self.network = None
+                self.equivalent = None
+                self.equivalent_selection = None
+                self.solution_cache.clear()
+                self.last_solution = self.previous_solution = None
                 
                 self.graph_view.draw_system(self.system)
                 self.params_panel.load_system(self.system)
@@ -125,6 +278,255 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "Erro ao Abrir Arquivo", f"Não foi possível ler o arquivo:\n{e}")
                 self.status_bar.showMessage("Erro ao carregar arquivo.")
 
+    def define_equivalent(self):
+        if not self.system:
+            QMessageBox.warning(self, "Nenhum Sistema", "Por favor, abra um arquivo .PWF primeiro.")
+            return
+
+        text, ok = QInputDialog.getText(
+            self, "Equivalente de Rede",
+            "Barras a manter (ex: 454, 458) e/ou áreas com prefixo A (ex: A205).\n"
+            "Deixe vazio para usar a rede completa:")
+        if not ok:
+            return
+
+        bus_numbers, areas = [], []
+        for token in text.replace(',', ' ').split():
+            if token.upper().startswith('A') and token[1:].isdigit():
+                areas.append(int(token[1:]))
+            elif token.isdigit():
+                bus_numbers.append(int(token))
+
+        if not bus_numbers and not areas:
+            self.equivalent = None
+            self.equivalent_selection = None
+            self.log_output.append("Equivalente removido. Usando a rede completa.")
+            self.status_bar.showMessage("Rede completa.")
+            return
+
+        try:
+            self.update_network()
+            self.equivalent = reduce_network(self.system, bus_numbers, areas, network=self.network)
+            self.equivalent_selection = (bus_numbers, areas)
+            self.log_output.append(
+                f"Equivalente criado: {len(self.equivalent.bus_map)} barras mantidas, "
+                f"{len(self.equivalent.external_buses)} barras externas eliminadas.")
+            for bus_num, s_eq in self.equivalent.equivalent_injections.items():
+                self.log_output.append(
+                    f"  Injeção equivalente na barra {bus_num}: {s_eq.real:.3f} MW / {s_eq.imag:.3f} MVAr")
+            self.status_bar.showMessage("Equivalente de rede ativo.")
+        except Exception as e:
+            self.equivalent = None
+            self.equivalent_selection = None
+            QMessageBox.critical(self, "Erro no Equivalente", f"Não foi possível reduzir a rede:\n{e}")
+
+    def save_file(self):
+        if not self.system:
+            QMessageBox.warning(self, "Nenhum Sistema", "Por favor, abra um arquivo .PWF primeiro.")
+            return
+
+        filepath, _ = QFileDialog.getSaveFileName(self, "Salvar Arquivo PWF", "", "Arquivos PWF (*.pwf);;Todos os Arquivos (*)")
+        if filepath:
+            try:
+                write_pwf(self.system, filepath)
+                self.log_output.append(f"Sistema gravado em: {filepath}")
+                self.status_bar.showMessage("Arquivo salvo.")
+            except Exception as e:
+                QMessageBox.critical(self, "Erro ao Salvar Arquivo", f"Não foi possível gravar o arquivo:\n{e}")
+
+    def undo_edit(self):
+        self.show_journal_edit(self.system.undo() if self.system else None, "Desfeito")
+
+    def redo_edit(self):
+        self.show_journal_edit(self.system.redo() if self.system else None, "Refeito")
+
+    def show_journal_edit(self, edit, verb):
+        if edit is None:
+            self.status_bar.showMessage("Nada a desfazer/refazer.")
+            return
+        self.params_panel.refresh_edit(edit)
+        self.graph_view.refresh_edit(edit)
+        self.status_bar.showMessage(f"{verb}: {edit.describe()}")
+
+    def update_network(self):
+        """
+        Atualiza a Ybus da rede completa refazendo só as etapas invalidadas
+        pelas alterações registradas no diário desde o último cálculo:
+        topologia -> Ybus e bus_map novos; parâmetros de ramo/shunt -> só as
+        estampas alteradas; injeções ou desenho -> Ybus reaproveitada.
+        Retorna True se algo além do desenho mudou.
+        """
+        pending, previous = self.system.take_pending()
+        if self.network is None or INVALIDATES_TOPOLOGY in pending:
+            self.network = solvers.build_ybus(self.system)
+        elif INVALIDATES_YBUS in pending:
+            ybus, bus_map = self.network
+            self.network = (solvers.update_ybus(ybus, bus_map, self.system, previous), bus_map)
+            self.log_output.append("Ybus atualizada só nos elementos alterados.")
+        elif pending - {INVALIDATES_LAYOUT}:
+            self.log_output.append("Só injeções alteradas: Ybus reaproveitada.")
+        return bool(pending - {INVALIDATES_LAYOUT})
+
+    def get_study_network(self):
+        """ Retorna (sistema, ybus, bus_map) da rede completa ou do equivalente ativo. """
+        changed = self.update_network()
+        if self.equivalent:
+            if changed:
+                # O equivalente depende da rede e das injeções externas
+                self.equivalent = reduce_network(self.system, *self.equivalent_selection,
+                                                 network=self.network)
+                self.log_output.append("Equivalente refeito após alterações na rede.")
+            return self.equivalent.system, self.equivalent.ybus, self.equivalent.bus_map
+        ybus, bus_map = self.network
+        return self.system, ybus, bus_map
+
+    def run_pv_curve(self):
+        if not self.system:
+            QMessageBox.warning(self, "Nenhum Sistema", "Por favor, abra um arquivo .PWF primeiro.")
+            return
+
+        text, ok = QInputDialog.getText(
+            self, "Curva PV",
+            "Barras monitoradas (ex: 454, 461).\nDeixe vazio para todas as barras PQ:")
+        if not ok:
+            return
+        monitored = [int(tok) for tok in text.replace(',', ' ').split() if tok.isdigit()] or None
+
+        self.status_bar.showMessage("Traçando curvas PV...")
+        self.log_output.append("\n" + "="*30)
+        try:
+            study_system, ybus, bus_map = self.get_study_network()
+            _, v0 = self.solution_cache.lookup(study_system, bus_map)
+            result = run_continuation(study_system, ybus, bus_map, monitored_buses=monitored, v0=v0)
+            self.log_output.append(result.log)
+            if not result.lambdas:
+                self.status_bar.showMessage("Fluxo continuado falhou.")
+                return
+
+            header = "λ".rjust(10) + "".join(f"{bus_num:>10}" for bus_num in result.monitored_buses)
+            self.log_output.append("--- Curvas PV (V em pu) ---")
+            self.log_output.append(header)
+            for i, lam in enumerate(result.lambdas):
+                marker = " <- nariz" if i == result.nose_index else ""
+                row = f"{lam:10.4f}" + "".join(f"{result.voltages[b][i]:10.4f}" for b in result.monitored_buses)
+                self.log_output.append(row + marker)
+            self.status_bar.showMessage(f"Curva PV concluída. λ máx = {result.nose_lambda:.4f}")
+        except Exception as e:
+            self.status_bar.showMessage("Erro crítico durante o fluxo continuado.")
+            self.log_output.append(f"\nERRO CRÍTICO: {e}")
+
+    def run_sensitivity(self):
+        if not self.system:
+            QMessageBox.warning(self, "Nenhum Sistema", "Por favor, abra um arquivo .PWF primeiro.")
+            return
+
+        text, ok = QInputDialog.getText(
+            self, "Sensibilidade de Tensão",
+            "Barras candidatas (ex: 454, 461).\nDeixe vazio para todas as barras PQ:")
+        if not ok:
+            return
+
+        try:
+            study_system, ybus, bus_map = self.get_study_network()
+            # A rede pode ter mudado desde a última análise (alterações, equivalente)
+            if (self.sensitivity is None or self.sensitivity.system is not study_system
+                    or self.sensitivity.ybus is not ybus or self.sensitivity.bus_map != bus_map):
+                self.sensitivity = SensitivityAnalyzer(study_system, ybus, bus_map)
+
+            _, _, pq = solvers.get_bus_types(study_system, bus_map)
+            pq_buses = {num for num, idx in bus_map.items() if idx in set(pq)}
+            requested = [int(tok) for tok in text.replace(',', ' ').split() if tok.isdigit()]
+            candidates = [num for num in requested if num in pq_buses] if requested else sorted(pq_buses)
+            if not candidates:
+                QMessageBox.warning(self, "Sensibilidade", "Nenhuma barra PQ válida selecionada.")
+                return
+
+            sens = self.sensitivity.self_dv_dq(candidates)
+            self.log_output.append("\n" + "="*30)
+            self.log_output.append("--- Sensibilidade dV/dQ (pu/pu), da barra mais fraca para a mais forte ---")
+            for bus_num, value in sorted(sens.items(), key=lambda item: -item[1]):
+                # ΔV estimado para 10 MVAr de compensação capacitiva na barra
+                delta_v = value * 10 / solvers.BASE_MVA
+                self.log_output.append(f"Barra {bus_num}: dV/dQ = {value:.5f} (ΔV ≈ {delta_v:.4f} pu por 10 MVAr)")
+            self.status_bar.showMessage("Sensibilidades calculadas.")
+        except Exception as e:
+            self.status_bar.showMessage("Erro no cálculo de sensibilidades.")
+            self.log_output.append(f"\nERRO: {e}")
+
+    def run_comparison(self):
+        if not self.system:
+            QMessageBox.warning(self, "Nenhum Sistema", "Por favor, abra um arquivo .PWF primeiro.")
+            return
+
+        options = ["Outro arquivo .PWF"]
+        if self.previous_solution is not None:
+            options.append("Cálculo anterior")
+        choice, ok = QInputDialog.getItem(self, "Comparar Casos", "Comparar o caso atual com:", options, 0, False)
+        if not ok:
+            return
+
+        try:
+            if choice == "Cálculo anterior":
+                # A = cálculo anterior, B = último cálculo
+                comparison = compare_cases(self.previous_solution, self.last_solution)
+                missing_buses, missing_branches = comparison.added_buses, comparison.added_branches
+            else:
+                filepath, _ = QFileDialog.getOpenFileName(self, "Caso para Comparação", "",
+                                                          "Arquivos PWF (*.pwf);;Todos os Arquivos (*)")
+                if not filepath:
+                    return
+                # A = caso atual, B = arquivo
+                self.status_bar.showMessage("Comparando casos...")
+                comparison = compare_cases(CaseArrays(self.system), filepath)
+                missing_buses, missing_branches = comparison.removed_buses, comparison.removed_branches
+
+            changed_buses = comparison.changed_buses()
+            changed_branches = comparison.changed_branches()
+            self.log_output.append("\n" + "="*30)
+            self.log_output.append(comparison.summary())
+            self.params_panel.highlight_comparison(changed_buses, changed_branches,
+                                                   set(missing_buses.tolist()), set(missing_branches.tolist()))
+            self.graph_view.highlight_comparison(changed_buses, changed_branches,
+                                                 missing_buses.tolist(), missing_branches.tolist())
+            self.status_bar.showMessage(
+                f"Comparação concluída: {len(changed_buses)} barras e {len(changed_branches)} ramos alterados.")
+            self.log_dock.show()
+        except Exception as e:
+            self.status_bar.showMessage("Erro na comparação.")
+            self.log_output.append(f"\nERRO: {e}")
+
+    def run_time_series(self):
+        if not self.system:
+            QMessageBox.warning(self, "Nenhum Sistema", "Por favor, abra um arquivo .PWF primeiro.")
+            return
+
+        csv_path, _ = QFileDialog.getOpenFileName(self, "Abrir Perfis", "", "Arquivos CSV (*.csv);;Todos os Arquivos (*)")
+        if not csv_path:
+            return
+        output_dir = QFileDialog.getExistingDirectory(self, "Pasta de Saída dos Resultados")
+        if not output_dir:
+            return
+
+        self.status_bar.showMessage("Executando série temporal...")
+        self.log_output.append("\n" + "="*30)
+        try:
+            labels, profiles = load_profiles_csv(csv_path)
+            self.log_output.append(f"Perfis lidos: {len(profiles)} colunas, {len(labels)} passos.")
+            study_system, ybus, bus_map = self.get_study_network()
+            success = run_time_series(
+                study_system, ybus, bus_map, labels, profiles, output_dir,
+                progress=self.show_time_series_progress)
+            self.log_output.append(study_system.log)
+            self.status_bar.showMessage("Série temporal concluída." if success else "Série temporal concluída com passos não convergidos.")
+        except Exception as e:
+            self.status_bar.showMessage("Erro crítico durante a série temporal.")
+            self.log_output.append(f"\nERRO CRÍTICO: {e}")
+
+    def show_time_series_progress(self, done, total):
+        self.status_bar.showMessage(f"Série temporal: trecho {done}/{total}")
+        # Só redesenha: entradas do usuário ficam para depois da série
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+
     def run_calculation(self):
         if not self.system:
             QMessageBox.warning(self, "Nenhum Sistema", "Por favor, abra um arquivo .PWF primeiro.")
@@ -135,20 +537,53 @@ class MainWindow(QMainWindow):
         self.log_output.append(f"Iniciando cálculo com solver: {self.current_solver}")
 
         try:
-            # 1. Construir a Matriz Ybus
-            ybus, bus_map = solvers.build_ybus(self.system)
+            # 1. Construir a Matriz Ybus (ou usar a do equivalente ativo)
+            study_system, ybus, bus_map = self.get_study_network()
+            if self.equivalent:
+                self.log_output.append(f"Usando equivalente de rede ({len(bus_map)} barras).")
             self.log_output.append(f"Matriz Ybus ({ybus.shape[0]}x{ybus.shape[0]}) construída.")
             
-            # 2. Chamar o solver selecionado
+            # 2. Consultar o cache de soluções (caso idêntico ou partida a quente)
+            is_exact, v0 = self.solution_cache.lookup(study_system, bus_map)
+            study_system.clear_results()
+
+            # 3. Chamar o solver selecionado
             success = False
-            if self.current_solver == 'newton':
-                success = solvers.solve_newton_raphson(self.system, ybus, bus_map)
-            elif self.current_solver == 'gauss_seidel':
-                success = solvers.solve_gauss_seidel(self.system, ybus, bus_map)
-            elif self.current_solver == 'gauss_jacobi':
-                success = solvers.solve_gauss_jacobi(self.system, ybus, bus_map)
-
-            # 3. Mostrar log e resultados
+            if is_exact:
+                solvers.store_voltage_results(study_system, bus_map, v0)
+                study_system.log = "Caso idêntico já calculado: solução recuperada do cache.\n"
+                study_system.results = "Concluído (cache)"
+                success = True
+            else:
+                if v0 is not None:
+                    self.log_output.append("Partida a quente a partir da solução mais próxima em cache.")
+                if self.current_solver == 'newton' and self.graph_view.overlay_mode:
+                    success = self.solve_with_overlay(solvers.solve_newton_raphson,
+                                                      study_system, ybus, bus_map, v0=v0)
+                elif self.current_solver == 'newton':
+                    success = solvers.solve_newton_raphson(study_system, ybus, bus_map, v0=v0)
+                elif self.current_solver == 'gauss_seidel':
+                    success = solvers.solve_gauss_seidel(study_system, ybus, bus_map, v0=v0)
+                elif self.current_solver == 'gauss_jacobi':
+                    success = solvers.solve_gauss_jacobi(study_system, ybus, bus_map, v0=v0)
+                elif self.current_solver == 'helm':
+                    # Não usa partida a quente: a série parte sempre do estado sem carga
+                    helm_options = dict(max_terms=self.helm_terms, tolerance=self.helm_tolerance)
+                    if self.graph_view.overlay_mode:
+                        success = self.solve_with_overlay(solvers.solve_helm, study_system, ybus, bus_map,
+                                                          **helm_options)
+                    else:
+                        success = solvers.solve_helm(study_system, ybus, bus_map, **helm_options)
+                if success:
+                    self.solution_cache.store(study_system, bus_map)
+
+            # Fluxos, perdas e carregamento nos ramos
+            total_losses = compute_branch_flows(study_system, bus_map) if success else None
+
+            if self.equivalent:
+                self.equivalent.copy_results_to_full_system()
+
+            # 4. Mostrar log e resultados
             self.log_output.append(self.system.log)
             if success:
                 # Adiciona resumo dos resultados ao log
@@ -160,12 +595,24 @@ class MainWindow(QMainWindow):
                         self.log_output.append(
                             f"Barra {bus.number}: V = {bus.v_result:.4f} pu, Ângulo = {bus.angle_result:.3f}°"
                         )
+                if total_losses is not None:
+                    self.log_output.append(
+                        f"Perdas totais: {total_losses.real:.3f} MW / {total_losses.imag:.3f} MVAr")
+                    for branch in self.system.branches.values():
+                        if branch.loading is not None and branch.loading > 100:
+                            self.log_output.append(
+                                f"Sobrecarga no ramo {branch.get_id()}: {branch.loading:.1f}%")
 
                 self.status_bar.showMessage("Cálculo concluído com sucesso.")
                 self.log_output.append("Cálculo concluído.")
                 
+                # Guarda o cenário resolvido para comparação posterior
+                self.previous_solution = self.last_solution
+                self.last_solution = CaseArrays(self.system, title=f"{self.system.title} (último cálculo)")
+
                 # Atualiza o painel de parâmetros para destacar os resultados
                 self.params_panel.update_results()
+                self.graph_view.update_results()
                 
                 # Mostra aviso de conclusão
                 QMessageBox.information(self, "Cálculo Concluído", "O cálculo de fluxo de potência foi concluído com sucesso.")
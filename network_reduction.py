@@ -0,0 +1,193 @@
+# network_reduction.py
+import copy
+import numpy as np
+import scipy.sparse as sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import splu
+from power_system_model import PowerSystem
+import solvers
+
+def select_retained_buses(system: PowerSystem, bus_numbers=None, areas=None):
+    """
+    Define o conjunto de barras mantidas no equivalente, a partir de uma
+    lista de números de barra e/ou de uma lista de áreas (Bus.area).
+    """
+    retained = set()
+    if bus_numbers:
+        retained.update(num for num in bus_numbers if num in system.buses)
+    if areas:
+        areas = set(areas)
+        retained.update(num for num, bus in system.buses.items() if bus.area in areas)
+    return retained
+
+def kron_reduce(ybus, retained_idx, external_idx):
+    """
+    Eliminação de Kron esparsa: Yred = Yrr - Yre * inv(Yee) * Yer.
+
+    A inversa de Yee nunca é formada. Yee é fatorada uma única vez (LU
+    esparsa) e só as colunas de Yer ligadas à fronteira são resolvidas,
+    pois as demais são nulas.
+    Retorna (Yred, fatoração de Yee, Yre).
+    """
+    y_rr = ybus[retained_idx, :][:, retained_idx]
+    y_re = ybus[retained_idx, :][:, external_idx].tocsc()
+    y_er = ybus[external_idx, :][:, retained_idx].tocsc()
+    y_ee = ybus[external_idx, :][:, external_idx].tocsc()
+
+    lu_ee = splu(y_ee)
+
+    # Colunas de Yer não nulas = barras de fronteira (mantidas com vizinho externo)
+    boundary_cols = np.flatnonzero(np.diff(y_er.indptr))
+    if len(boundary_cols) == 0:
+        return y_rr.tocsc(), lu_ee, y_re
+
+    # Linhas de Yre não nulas: a correção só tem termos fronteira x fronteira
+    boundary_rows = np.flatnonzero(np.diff(y_re.tocsr().indptr))
+    x = lu_ee.solve(y_er[:, boundary_cols].toarray()) # Externas x fronteira
+    fill = y_re[boundary_rows, :] @ x
+    rows = np.repeat(boundary_rows, len(boundary_cols))
+    cols = np.tile(boundary_cols, len(boundary_rows))
+    correction = sparse.coo_matrix((fill.ravel(), (rows, cols)), shape=y_rr.shape)
+    return (y_rr - correction.tocsc()).tocsc(), lu_ee, y_re
+
+class NetworkEquivalent:
+    """
+    Equivalente de Ward de uma rede parcial.
+
+    Mantém as barras selecionadas, elimina as externas por redução de Kron
+    e representa as injeções externas como injeções equivalentes nas barras
+    de fronteira. O sistema reduzido (self.system) e sua Ybus (self.ybus,
+    self.bus_map) podem ser passados diretamente a qualquer solver.
+    network: (ybus, bus_map) da rede completa, se já estiver montada.
+
+    Com o caso base resolvido, as injeções externas são as calculadas
+    (S = V * conj(Ybus * V), incluindo a geração da referência) e, se a
+    barra de referência for eliminada, uma barra de fronteira passa a ser
+    a referência com a tensão do caso base. Sem caso base o equivalente é
+    aproximado (injeções especificadas e perfil plano).
+    """
+    def __init__(self, system: PowerSystem, retained, network=None):
+        if not retained:
+            raise ValueError("Nenhuma barra selecionada para o equivalente.")
+
+        self.full_system = system
+        ybus, bus_map = network or solvers.build_ybus(system)
+        retained = sorted(num for num in retained if num in bus_map)
+        retained_set = set(retained)
+
+        # Descarta ilhas externas sem ligação com a rede mantida
+        # (Yee seria singular e elas não afetam a região de estudo)
+        _, labels = connected_components(abs(ybus), directed=False)
+        kept_labels = {labels[bus_map[num]] for num in retained}
+        external = sorted(num for num, idx in bus_map.items()
+                          if num not in retained_set and labels[idx] in kept_labels)
+        discarded = len(bus_map) - len(retained) - len(external)
+        if discarded:
+            print(f"Aviso: {discarded} barras externas isoladas da região mantida foram descartadas.")
+
+        retained_idx = [bus_map[num] for num in retained]
+        external_idx = [bus_map[num] for num in external]
+
+        v_base = solvers.get_result_voltage(system, bus_map)
+        if v_base is None and external_idx:
+            print("Aviso: caso base não resolvido; o equivalente usa as injeções especificadas "
+                  "e perfil plano (resultado aproximado).")
+
+        if external_idx:
+            y_red, lu_ee, y_re = kron_reduce(ybus, retained_idx, external_idx)
+            s_eq = self._ward_injections(system, ybus, bus_map, retained, external, lu_ee, y_re, v_base)
+        else:
+            y_red = ybus[retained_idx, :][:, retained_idx].tocsc()
+            s_eq = np.zeros(len(retained), dtype=complex)
+
+        self.ybus = y_red
+        self.bus_map = {num: idx for idx, num in enumerate(retained)}
+        self.external_buses = external
+        self.equivalent_injections = {num: s_eq[idx] * solvers.BASE_MVA
+                                      for num, idx in self.bus_map.items() if abs(s_eq[idx]) > 1e-9}
+        self.system = self._build_reduced_system(system, retained_set)
+        self.reference_bus = self._set_reference(v_base)
+
+    def _ward_injections(self, system, ybus, bus_map, retained, external, lu_ee, y_re, v_base):
+        """
+        Converte as injeções externas em correntes (com a tensão do caso base
+        resolvido, ou perfil plano) e as transfere para a fronteira:
+        Ieq = -Yre * inv(Yee) * Ie. Retorna as potências equivalentes em pu.
+        """
+        if v_base is not None:
+            # Injeções resolvidas: incluem a geração efetiva da referência e das PV
+            ext_idx = [bus_map[num] for num in external]
+            s_ext = (v_base * np.conj(ybus @ v_base))[ext_idx]
+        else:
+            s_ext = solvers.get_bus_injections(system, {num: i for i, num in enumerate(external)})
+        v_ext = np.array([self._base_voltage(system.buses[num]) for num in external])
+        v_ret = np.array([self._base_voltage(system.buses[num]) for num in retained])
+
+        i_ext = np.conj(s_ext / v_ext)
+        i_eq = -(y_re @ lu_ee.solve(i_ext))
+        return v_ret * np.conj(i_eq)
+
+    @staticmethod
+    def _base_voltage(bus):
+        if bus.v_result is not None and bus.angle_result is not None:
+            return bus.v_result * np.exp(1j * np.radians(bus.angle_result))
+        return 1.0 + 0j
+
+    def _set_reference(self, v_base):
+        """
+        Garante uma barra de referência no sistema reduzido. Se a original foi
+        eliminada, usa a barra de fronteira com maior injeção equivalente,
+        fixando módulo e ângulo do caso base. Retorna o número da barra.
+        """
+        for num, bus in self.system.buses.items():
+            if '2' in bus.type:
+                return num
+        if not self.equivalent_injections:
+            return None
+
+        num = max(self.equivalent_injections, key=lambda n: abs(self.equivalent_injections[n]))
+        bus = self.system.buses[num]
+        bus.type = '2'
+        if v_base is not None:
+            bus.voltage, bus.angle = bus.v_result, bus.angle_result
+            print(f"Aviso: barra de referência eliminada; barra {num} usada como referência "
+                  f"com a tensão do caso base ({bus.voltage:.4f} pu, {bus.angle:.2f}°).")
+        else:
+            print(f"Aviso: barra de referência eliminada e caso base não resolvido; barra {num} "
+                  "usada como referência com a tensão do arquivo (ângulos aproximados).")
+        return num
+
+    def _build_reduced_system(self, system, retained_set):
+        reduced = PowerSystem()
+        reduced.title = f"{system.title} (equivalente)"
+        reduced.buses = {num: copy.deepcopy(system.buses[num]) for num in self.bus_map}
+        reduced.branches = {br_id: copy.deepcopy(br) for br_id, br in system.branches.items()
+                            if br.from_bus in retained_set and br.to_bus in retained_set}
+
+        # Injeções equivalentes somadas à geração das barras de fronteira
+        for num, s_eq in self.equivalent_injections.items():
+            reduced.buses[num].p_gen += s_eq.real
+            reduced.buses[num].q_gen += s_eq.imag
+
+        reduced._original_buses = {num: system._original_buses.get(num, bus)
+                                   for num, bus in reduced.buses.items()}
+        reduced._original_branches = copy.deepcopy(reduced.branches)
+        return reduced
+
+    def copy_results_to_full_system(self):
+        """ Copia os resultados do sistema reduzido para as barras do sistema completo. """
+        for num, bus in self.system.buses.items():
+            full_bus = self.full_system.buses[num]
+            full_bus.v_result = bus.v_result
+            full_bus.angle_result = bus.angle_result
+        for br_id, branch in self.system.branches.items():
+            full_branch = self.full_system.branches[br_id]
+            for attr in ('p_from', 'q_from', 'p_to', 'q_to', 'p_loss', 'q_loss', 'loading'):
+                setattr(full_branch, attr, getattr(branch, attr))
+        self.full_system.results = self.system.results
+        self.full_system.log = self.system.log
+
+def reduce_network(system: PowerSystem, bus_numbers=None, areas=None, network=None):
+    """ Cria o equivalente de rede mantendo as barras e/ou áreas indicadas. """
+    retained = select_retained_buses(system, bus_numbers, areas)
+    return NetworkEquivalent(system, retained, network)
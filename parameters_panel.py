@@ -3,16 +3,34 @@ from PyQt6.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QTabWidget,
                              QTableWidget, QTableWidgetItem, QPushButton,
                              QAbstractItemView, QHeaderView, QCheckBox,
                              QHBoxLayout)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QColor
 
+# Colunas editáveis das tabelas: {coluna: campo do modelo}
+BUS_COLUMN_FIELDS = {6: 'p_load', 7: 'q_load', 8: 'p_gen', 9: 'q_gen'}
+BRANCH_COLUMN_FIELDS = {5: 'r', 6: 'x', 7: 'tap'}
+
+# Coluna destacada na comparação de casos para cada campo (demais: coluna do número/ID)
+BUS_FIELD_COLUMNS = {'voltage': 4, 'v_result': 4, 'angle': 5, 'angle_result': 5,
+                     'p_load': 6, 'q_load': 7, 'p_gen': 8, 'q_gen': 9}
+BRANCH_FIELD_COLUMNS = {'r': 5, 'x': 6, 'tap': 7, 'p_from': 8, 'q_from': 9,
+                        'p_to': 10, 'q_to': 11, 'loading': 13}
+
 class ParametersPanel(QDockWidget):
     """ Painel para visualização e manipulação dos dados. """
+    # Mensagens para a barra de status (edições, valores inválidos)
+    message = pyqtSignal(str)
+
     def __init__(self, parent=None):
         super().__init__("Parâmetros do Sistema", parent)
         self.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea)
         self.system = None
+        self.bus_rows = {} # {número da barra: linha}
+        self.branch_rows = {} # {ID do ramo: linha}
         self.highlight_color = QColor(200, 230, 255) # Azul claro para destaque
+        self.overload_color = QColor(255, 200, 200) # Vermelho claro para sobrecarga
+        self.changed_color = QColor(255, 236, 179) # Amarelo claro: alterado na comparação
+        self.missing_color = QColor(224, 224, 224) # Cinza: ausente no outro caso
         
         # Widget principal
         main_widget = QWidget()
@@ -41,19 +59,37 @@ class ParametersPanel(QDockWidget):
             table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)            
             table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
             table.horizontalHeader().setStretchLastSection(True)
+        self.bus_table.cellChanged.connect(self.on_bus_cell_changed)
+        self.branch_table.cellChanged.connect(self.on_branch_cell_changed)
 
     def load_system(self, system):
         self.system = system
+        self.bus_table.blockSignals(True)
+        self.branch_table.blockSignals(True)
         self.populate_bus_table()
         self.populate_branch_table()
+        self._set_read_only(self.bus_table, BUS_COLUMN_FIELDS)
+        self._set_read_only(self.branch_table, BRANCH_COLUMN_FIELDS)
+        self.bus_table.blockSignals(False)
+        self.branch_table.blockSignals(False)
+
+    def _set_read_only(self, table, editable_columns):
+        """ Só as colunas ligadas a campos do modelo podem ser editadas. """
+        for row in range(table.rowCount()):
+            for col in range(table.columnCount()):
+                item = table.item(row, col)
+                if item is not None and col not in editable_columns:
+                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
 
     def populate_bus_table(self):
         headers = ["Status", "Num", "Nome", "Tipo", "V (pu)", "Ang (°)", "P Carga", "Q Carga", "P Ger", "Q Ger"]
         self.bus_table.setRowCount(len(self.system.buses))
         self.bus_table.setColumnCount(len(headers))
         self.bus_table.setHorizontalHeaderLabels(headers)
+        self.bus_rows = {}
 
         for i, bus in enumerate(self.system.buses.values()):
+            self.bus_rows[bus.number] = i
             # Checkbox de Status
             checkbox = self._create_checkbox(bus.status, lambda state, b=bus: self._toggle_bus_status(state, b))
             self.bus_table.setCellWidget(i, 0, checkbox)
@@ -71,12 +107,15 @@ class ParametersPanel(QDockWidget):
         self.bus_table.resizeColumnsToContents()
 
     def populate_branch_table(self):
-        headers = ["Status", "ID", "De", "Para", "Tipo", "R (pu)", "X (pu)", "Tap"]
+        headers = ["Status", "ID", "De", "Para", "Tipo", "R (%)", "X (%)", "Tap",
+                   "P De (MW)", "Q De (MVAr)", "P Para (MW)", "Q Para (MVAr)", "Perdas (MW)", "Carreg. (%)"]
         self.branch_table.setRowCount(len(self.system.branches))
         self.branch_table.setColumnCount(len(headers))
         self.branch_table.setHorizontalHeaderLabels(headers)
+        self.branch_rows = {}
 
         for i, branch in enumerate(self.system.branches.values()):
+            self.branch_rows[branch.get_id()] = i
             tipo = "TR" if branch.is_transformer else "LT"
             
             # Checkbox de Status
@@ -90,6 +129,8 @@ class ParametersPanel(QDockWidget):
             self.branch_table.setItem(i, 5, QTableWidgetItem(f"{branch.r:.5f}"))
             self.branch_table.setItem(i, 6, QTableWidgetItem(f"{branch.x:.5f}"))
             self.branch_table.setItem(i, 7, QTableWidgetItem(str(branch.tap)))
+            for col in range(8, 14): # Resultados (preenchidos após o cálculo)
+                self.branch_table.setItem(i, col, QTableWidgetItem("-"))
 
         self.branch_table.resizeColumnsToContents()
 
@@ -107,12 +148,59 @@ class ParametersPanel(QDockWidget):
         return widget
 
     def _toggle_bus_status(self, state, bus):
-        bus.status = (state == Qt.CheckState.Checked.value)
-        print(f"Barra {bus.number} status alterado para: {bus.status}")
+        self._report(self.system.edit('bus', bus.number, 'status', state == Qt.CheckState.Checked.value))
 
     def _toggle_branch_status(self, state, branch):
-        branch.status = (state == Qt.CheckState.Checked.value)
-        print(f"Ramo {branch.get_id()} status alterado para: {branch.status}")
+        self._report(self.system.edit('branch', branch.get_id(), 'status', state == Qt.CheckState.Checked.value))
+
+    def on_bus_cell_changed(self, row, col):
+        if col in BUS_COLUMN_FIELDS:
+            bus_num = int(self.bus_table.item(row, 1).text())
+            self._edit_cell(self.bus_table, row, col, 'bus', bus_num, BUS_COLUMN_FIELDS[col])
+
+    def on_branch_cell_changed(self, row, col):
+        if col in BRANCH_COLUMN_FIELDS:
+            br_id = self.branch_table.item(row, 1).text()
+            self._edit_cell(self.branch_table, row, col, 'branch', br_id, BRANCH_COLUMN_FIELDS[col])
+
+    def _edit_cell(self, table, row, col, target, key, field):
+        """ Grava no sistema (e no diário) o valor digitado na célula. """
+        item = table.item(row, col)
+        try:
+            self._report(self.system.edit(target, key, field, float(item.text().replace(',', '.'))))
+        except ValueError:
+            self.message.emit(f"Valor inválido: '{item.text()}'")
+        # Reescreve o valor aceito (ou o anterior, se o texto era inválido)
+        self._set_cell(table, row, col, field, self.system.get_edit_value(target, key, field))
+
+    def _report(self, edit):
+        if edit:
+            self.message.emit(edit.describe())
+
+    def _set_cell(self, table, row, col, field, value):
+        table.blockSignals(True)
+        table.item(row, col).setText(f"{value:.5f}" if field in ('r', 'x') else str(value))
+        table.blockSignals(False)
+
+    def refresh_edit(self, edit):
+        """ Reflete na tabela uma alteração desfeita/refeita. """
+        if edit.target == 'bus' and edit.key in self.bus_rows:
+            table, row, fields = self.bus_table, self.bus_rows[edit.key], BUS_COLUMN_FIELDS
+            obj = self.system.buses[edit.key]
+        elif edit.target == 'branch' and edit.key in self.branch_rows:
+            table, row, fields = self.branch_table, self.branch_rows[edit.key], BRANCH_COLUMN_FIELDS
+            obj = self.system.branches[edit.key]
+        else:
+            return
+
+        if edit.field == 'status':
+            checkbox = table.cellWidget(row, 0).findChild(QCheckBox)
+            checkbox.blockSignals(True)
+            checkbox.setChecked(obj.status)
+            checkbox.blockSignals(False)
+        for col, field in fields.items():
+            if field == edit.field:
+                self._set_cell(table, row, col, field, getattr(obj, field))
 
     def update_results(self):
         """Atualiza a tabela de barras com os resultados e destaca as mudanças."""
@@ -144,20 +232,52 @@ class ParametersPanel(QDockWidget):
                 if abs(bus.angle_result - self.system._original_buses[bus_num].angle) > 1e-4:
                     item_a.setBackground(self.highlight_color)
 
+        # Fluxos nos ramos
+        branch_row_map = {self.branch_table.item(i, 1).text(): i for i in range(self.branch_table.rowCount())}
+        for br_id, branch in self.system.branches.items():
+            if br_id not in branch_row_map or branch.p_from is None:
+                continue
+
+            row = branch_row_map[br_id]
+            values = [branch.p_from, branch.q_from, branch.p_to, branch.q_to, branch.p_loss]
+            for col, value in enumerate(values, start=8):
+                self.branch_table.item(row, col).setText(f"{value:.2f}")
+
+            item_load = self.branch_table.item(row, 13)
+            if branch.loading is not None:
+                item_load.setText(f"{branch.loading:.1f}")
+                if branch.loading > 100:
+                    item_load.setBackground(self.overload_color)
+
+    def highlight_comparison(self, changed_buses, changed_branches, missing_buses, missing_branches):
+        """
+        Destaca o resultado de uma comparação de casos: células dos campos
+        alterados e elementos que não existem no outro caso.
+        """
+        self._clear_highlights()
+        tables = ((self.bus_table, self.bus_rows, BUS_FIELD_COLUMNS, changed_buses, missing_buses),
+                  (self.branch_table, self.branch_rows, BRANCH_FIELD_COLUMNS, changed_branches, missing_branches))
+        for table, rows, field_columns, changed, missing in tables:
+            for key, fields in changed.items():
+                if key in rows:
+                    for field in fields:
+                        table.item(rows[key], field_columns.get(field, 1)).setBackground(self.changed_color)
+            for key in missing:
+                if key in rows:
+                    for col in range(1, table.columnCount()):
+                        table.item(rows[key], col).setBackground(self.missing_color)
+
     def on_restore(self):
         if self.system:
             self.system.restore_original_data()
             self._clear_highlights()
             self.load_system(self.system) # Recarrega tabelas
-            print("Dados restaurados e destaques limpos.")
+            self.message.emit("Dados restaurados e destaques limpos.")
 
     def _clear_highlights(self):
         """Remove o destaque de fundo de todas as células."""
         default_color = QColor(Qt.GlobalColor.transparent)
-        for row in range(self.bus_table.rowCount()):
-            # Colunas de Tensão (4) e Ângulo (5)
-            self.bus_table.item(row, 4).setBackground(default_color)
-            self.bus_table.item(row, 5).setBackground(default_color)
-
-    # TODO: Implementar 'on_cell_changed' para atualizar o self.system
-    # quando o usuário editar um valor na tabela.
\ No newline at end of file
+        for table in [self.bus_table, self.branch_table]:
+            for row in range(table.rowCount()):
+                for col in range(1, table.columnCount()):
+                    table.item(row, col).setBackground(default_color)
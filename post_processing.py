@@ -0,0 +1,52 @@
+# post_processing.py
+import numpy as np
+from power_system_model import PowerSystem
+import solvers
+
+class BranchFlows:
+    """
+    Cálculo vetorizado de fluxos, perdas e carregamento nos ramos.
+
+    As matrizes Yf/Yt e os vetores de capacidade são montados uma única vez
+    na criação; compute() pode então ser chamado para vários vetores de
+    tensão (ex: passos de uma série temporal) só com produtos esparsos.
+    """
+    def __init__(self, system: PowerSystem, bus_map):
+        self.yf, self.yt, self.from_idx, self.to_idx, self.branch_ids = \
+            solvers.build_branch_admittances(system, bus_map)
+        ratings = np.array([system.branches[br_id].rating_normal for br_id in self.branch_ids])
+        # Ramos sem capacidade informada ficam com carregamento NaN
+        self.rating = np.where(ratings > 0, ratings, np.nan)
+
+    def compute(self, V):
+        """
+        Retorna (S_de, S_para, perdas, carregamento %) para o vetor de
+        tensões V. Potências complexas em MVA.
+        """
+        s_from = V[self.from_idx] * np.conj(self.yf @ V) * solvers.BASE_MVA
+        s_to = V[self.to_idx] * np.conj(self.yt @ V) * solvers.BASE_MVA
+        losses = s_from + s_to
+        loading = np.maximum(np.abs(s_from), np.abs(s_to)) / self.rating * 100
+        return s_from, s_to, losses, loading
+
+    def store(self, system: PowerSystem, s_from, s_to, losses, loading):
+        """ Grava os resultados nos objetos Branch. """
+        for i, br_id in enumerate(self.branch_ids):
+            branch = system.branches[br_id]
+            branch.p_from, branch.q_from = float(s_from[i].real), float(s_from[i].imag)
+            branch.p_to, branch.q_to = float(s_to[i].real), float(s_to[i].imag)
+            branch.p_loss, branch.q_loss = float(losses[i].real), float(losses[i].imag)
+            branch.loading = None if np.isnan(loading[i]) else float(loading[i])
+
+def compute_branch_flows(system: PowerSystem, bus_map):
+    """
+    Calcula e grava os fluxos nos ramos a partir da solução das barras.
+    Retorna as perdas totais (MVA) ou None se o sistema não estiver resolvido.
+    """
+    V = solvers.get_result_voltage(system, bus_map)
+    if V is None:
+        return None
+    flows = BranchFlows(system, bus_map)
+    s_from, s_to, losses, loading = flows.compute(V)
+    flows.store(system, s_from, s_to, losses, loading)
+    return complex(losses.sum())
@@ -2,14 +2,48 @@
 import copy
 import re
 
-def parse_pwf_float(value: str, default: float = 0.0) -> float:
+# Atributos que podem ser alterados por cenários/trabalhos externos
+BUS_EDITABLE_FIELDS = {'status', 'p_load', 'q_load', 'p_gen', 'q_gen', 'voltage', 'angle', 'shunt_b'}
+BRANCH_EDITABLE_FIELDS = {'status', 'r', 'x', 'shunt_b', 'tap'}
+
+# O que cada alteração invalida para o próximo cálculo
+INVALIDATES_TOPOLOGY = 'topology' # Barras/ramos ativos: bus_map e Ybus refeitos
+INVALIDATES_YBUS = 'ybus' # Só as estampas do elemento na Ybus
+INVALIDATES_INJECTIONS = 'injections' # Só os valores especificados (P, Q, V)
+INVALIDATES_LAYOUT = 'layout' # Só o desenho (nada a recalcular)
+
+BUS_FIELD_INVALIDATES = {
+    'status': INVALIDATES_TOPOLOGY,
+    'shunt_b': INVALIDATES_YBUS,
+    'p_load': INVALIDATES_INJECTIONS,
+    'q_load': INVALIDATES_INJECTIONS,
+    'p_gen': INVALIDATES_INJECTIONS,
+    'q_gen': INVALIDATES_INJECTIONS,
+    'voltage': INVALIDATES_INJECTIONS,
+    'angle': INVALIDATES_INJECTIONS,
+}
+BRANCH_FIELD_INVALIDATES = {
+    'status': INVALIDATES_TOPOLOGY,
+    'r': INVALIDATES_YBUS,
+    'x': INVALIDATES_YBUS,
+    'shunt_b': INVALIDATES_YBUS,
+    'tap': INVALIDATES_YBUS,
+}
+
+def parse_pwf_float(value: str, default: float = 0.0, implicit_decimals: int = 0) -> float:
     """
     Converte um valor float do formato PWF para float padrão.
     Ex: '059-' -> 1.059, ' 994-' -> 0.994, '-25.1' -> -25.1
+    Campos sem ponto decimal usam a posição implícita do campo
+    (ex: tensão com implicit_decimals=3: '1059' -> 1.059, '994' -> 0.994).
     """
     val = value.strip()
     if not val:
         return default
+
+    # Ponto decimal implícito (ex: campo de tensão do DBAR)
+    if implicit_decimals and re.fullmatch(r'-?\d+', val):
+        return int(val) / 10 ** implicit_decimals
     
     # Lógica para 'XXX-' (formato de tensão)
     if val.endswith('-') and len(val) == 4 and val[:-1].strip().isdigit():
@@ -46,10 +80,12 @@ class Bus:
         self.number = int(raw_data['number'])
         self.name = raw_data['name'].strip()
         self.type = raw_data['type']
+        self.base_group = raw_data.get('group', '')
+        self.limit_group = raw_data.get('limit_group', '')
         
-        self.status = True # Ligado por padrão
+        self.status = raw_data.get('state', '') != 'D' # Ligado por padrão
         # Usa a nova função de parse
-        self.voltage = parse_pwf_float(raw_data['voltage'], 1.0)
+        self.voltage = parse_pwf_float(raw_data['voltage'], 1.0, implicit_decimals=3)
         self.angle = parse_pwf_float(raw_data['angle'], 0.0)
         self.p_gen = parse_pwf_float(raw_data.get('p_gen', '0.0'))
         self.q_gen = parse_pwf_float(raw_data.get('q_gen', '0.0'))
@@ -58,6 +94,7 @@ class Bus:
         self.q_min = parse_pwf_float(raw_data.get('q_min', '0.0'))
         self.q_max = parse_pwf_float(raw_data.get('q_max', '0.0'))
         self.shunt_b = parse_pwf_float(raw_data.get('shunt_b', '0.0'))
+        self.controlled_bus = raw_data.get('controlled_bus', '')
         
         # Tenta converter 'area', mas não falha se estiver vazio
         area_str = raw_data.get('area', '0').strip()
@@ -83,7 +120,31 @@ class Branch:
         self.x = parse_pwf_float(raw_data['x'])
         self.shunt_b = parse_pwf_float(raw_data['shunt_b'])
         self.tap = parse_pwf_float(raw_data.get('tap', '1.0'), 1.0)
-        self.status = True # Ligado por padrão
+        self.tap_min = parse_pwf_float(raw_data.get('tap_min', ''), 0.0)
+        self.tap_max = parse_pwf_float(raw_data.get('tap_max', ''), 0.0)
+        self.phase = parse_pwf_float(raw_data.get('phase', ''), 0.0)
+        self.rating_normal = parse_pwf_float(raw_data.get('rating_normal', ''), 0.0)
+        self.rating_emergency = parse_pwf_float(raw_data.get('rating_emergency', ''), 0.0)
+        self.rating_equipment = parse_pwf_float(raw_data.get('rating_equipment', ''), 0.0)
+        self.status = raw_data.get('state', '') != 'D' # Ligado por padrão
+
+        # Campos do ANAREDE sem uso no cálculo, preservados na gravação
+        self.from_opening = raw_data.get('from_opening', '')
+        self.operation = raw_data.get('operation', '')
+        self.to_opening = raw_data.get('to_opening', '')
+        self.owner = raw_data.get('owner', '')
+        self.maneuver = raw_data.get('maneuver', '')
+        self.controlled_bus = raw_data.get('controlled_bus', '')
+        self.steps = raw_data.get('steps', '')
+
+        # Dados de resultado (MW / MVAr / %)
+        self.p_from = None
+        self.q_from = None
+        self.p_to = None
+        self.q_to = None
+        self.p_loss = None
+        self.q_loss = None
+        self.loading = None
 
     def get_id(self):
         return f"{self.from_bus}-{self.to_bus}-{self.circuit}"
@@ -92,6 +153,91 @@ class Branch:
         tipo = "TR" if self.is_transformer else "LT"
         return f"<{tipo} {self.get_id()} (R={self.r}, X={self.x})>"
 
+class Edit:
+    """ Alteração registrada no diário (alvo, campo, valor anterior e novo). """
+    def __init__(self, target: str, key, field: str, old, new):
+        self.target = target # 'bus', 'branch' ou 'layout'
+        self.key = key # Número da barra ou ID do ramo
+        self.field = field
+        self.old = old
+        self.new = new
+        if target == 'bus':
+            self.invalidates = BUS_FIELD_INVALIDATES[field]
+        elif target == 'branch':
+            self.invalidates = BRANCH_FIELD_INVALIDATES[field]
+        else:
+            self.invalidates = INVALIDATES_LAYOUT
+
+    def describe(self):
+        alvo = {'bus': "Barra", 'branch': "Ramo", 'layout': "Posição da barra"}[self.target]
+        return f"{alvo} {self.key}: {self.field} {self.old} -> {self.new}"
+
+    def __repr__(self):
+        return f"<Edit {self.target} {self.key}.{self.field}: {self.old!r} -> {self.new!r}>"
+
+class EditJournal:
+    """
+    Diário de alterações com desfazer/refazer.
+
+    Além da pilha de alterações, acumula o que foi invalidado desde o
+    último cálculo (take_pending), com o valor que cada campo alterado
+    tinha naquele momento, de modo que o próximo cálculo refaça só as
+    etapas afetadas.
+    """
+    def __init__(self):
+        self.edits = []
+        self.position = 0 # Alterações aplicadas; as seguintes podem ser refeitas
+        self.pending = set() # Invalidações desde o último cálculo
+        self.previous = {} # {(alvo, chave): {campo: valor no último cálculo}}
+
+    def record(self, edit: Edit):
+        del self.edits[self.position:] # Uma nova alteração descarta o refazer
+        self.edits.append(edit)
+        self.position += 1
+        self._invalidate(edit, edit.old)
+
+    def undo(self):
+        if not self.can_undo():
+            return None
+        self.position -= 1
+        edit = self.edits[self.position]
+        self._invalidate(edit, edit.new)
+        return edit
+
+    def redo(self):
+        if not self.can_redo():
+            return None
+        edit = self.edits[self.position]
+        self.position += 1
+        self._invalidate(edit, edit.old)
+        return edit
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < len(self.edits)
+
+    def _invalidate(self, edit: Edit, value_before):
+        self.pending.add(edit.invalidates)
+        if edit.invalidates != INVALIDATES_LAYOUT:
+            self.previous.setdefault((edit.target, edit.key), {}).setdefault(edit.field, value_before)
+
+    def invalidate_all(self):
+        """ Para alterações feitas fora do diário: o próximo cálculo refaz tudo. """
+        self.pending.add(INVALIDATES_TOPOLOGY)
+
+    def take_pending(self):
+        """ Retorna (invalidações, valores anteriores) e marca o sistema como calculado. """
+        pending, previous = self.pending, self.previous
+        self.pending, self.previous = set(), {}
+        return pending, previous
+
+    def clear(self):
+        self.edits.clear()
+        self.position = 0
+        self.invalidate_all()
+
 class PowerSystem:
     """ Contêiner principal para os dados da rede. """
     def __init__(self):
@@ -101,7 +247,17 @@ class PowerSystem:
         self._original_buses = {}
         self._original_branches = {}
         self.results = None
+        self.jacobian_factor = None # (LU, pvpq, pq) do último Newton-Raphson
         self.log = ""
+        self.journal = EditJournal()
+        self.layout = {} # {número da barra: (x, y)} posição no desenho
+
+    def __getstate__(self):
+        # A fatoração (SuperLU) não é serializável; é descartada em cópias e
+        # ao enviar o sistema para outros processos.
+        state = self.__dict__.copy()
+        state['jacobian_factor'] = None
+        return state
 
     def load_from_pwf(self, pwf_data: dict):
         """ Popula o sistema com dados do parser. """
@@ -126,12 +282,105 @@ class PowerSystem:
         # Guarda cópia de segurança para restauração
         self._original_buses = copy.deepcopy(self.buses)
         self._original_branches = copy.deepcopy(self.branches)
+        self.journal = EditJournal()
+        self.layout = {}
         print(f"Sistema carregado: {len(self.buses)} barras, {len(self.branches)} ramos.")
 
+    def apply_changes(self, changes: dict):
+        """
+        Aplica alterações no formato
+        {"buses": {num: {campo: valor}}, "branches": {id: {campo: valor}}}.
+        """
+        for bus_num, fields in (changes or {}).get('buses', {}).items():
+            bus = self.buses[int(bus_num)]
+            for attr, value in fields.items():
+                if attr not in BUS_EDITABLE_FIELDS:
+                    raise ValueError(f"Campo de barra não permitido: {attr}")
+                setattr(bus, attr, value)
+        for br_id, fields in (changes or {}).get('branches', {}).items():
+            branch = self.branches[br_id]
+            for attr, value in fields.items():
+                if attr not in BRANCH_EDITABLE_FIELDS:
+                    raise ValueError(f"Campo de ramo não permitido: {attr}")
+                setattr(branch, attr, value)
+        self.journal.invalidate_all()
+
+    def edit(self, target: str, key, field: str, value):
+        """
+        Altera um campo de barra ('bus'), ramo ('branch') ou a posição de
+        uma barra no desenho ('layout', campo 'position') e registra a
+        alteração no diário. Retorna o Edit (ou None se nada mudou).
+        """
+        if target == 'bus' and field not in BUS_EDITABLE_FIELDS:
+            raise ValueError(f"Campo de barra não permitido: {field}")
+        if target == 'branch' and field not in BRANCH_EDITABLE_FIELDS:
+            raise ValueError(f"Campo de ramo não permitido: {field}")
+
+        old = self.get_edit_value(target, key, field)
+        if old == value:
+            return None
+        edit = Edit(target, key, field, old, value)
+        self._set_edit_value(edit, value)
+        self.journal.record(edit)
+        return edit
+
+    def undo(self):
+        """ Desfaz a última alteração. Retorna o Edit desfeito (ou None). """
+        edit = self.journal.undo()
+        if edit:
+            self._set_edit_value(edit, edit.old)
+        return edit
+
+    def redo(self):
+        """ Refaz a última alteração desfeita. Retorna o Edit (ou None). """
+        edit = self.journal.redo()
+        if edit:
+            self._set_edit_value(edit, edit.new)
+        return edit
+
+    def get_edit_value(self, target, key, field):
+        """ Valor atual de um campo editável (barra, ramo ou posição no desenho). """
+        if target == 'layout':
+            return self.layout.get(key)
+        obj = self.buses[key] if target == 'bus' else self.branches[key]
+        return getattr(obj, field)
+
+    def _set_edit_value(self, edit: Edit, value):
+        if edit.target == 'layout':
+            self.layout[edit.key] = value
+        elif edit.target == 'bus':
+            setattr(self.buses[edit.key], edit.field, value)
+        else:
+            setattr(self.branches[edit.key], edit.field, value)
+
+    def take_pending(self):
+        """
+        Consome as invalidações do diário (ver EditJournal.take_pending).
+        Se a topologia ou a Ybus mudaram, os resultados e a fatoração da
+        Jacobiana deixam de valer para a rede atual e são apagados.
+        """
+        pending, previous = self.journal.take_pending()
+        if pending & {INVALIDATES_TOPOLOGY, INVALIDATES_YBUS}:
+            self.clear_results()
+        return pending, previous
+
+    def clear_results(self):
+        """ Apaga os resultados de um cálculo anterior. """
+        for bus in self.buses.values():
+            bus.v_result = None
+            bus.angle_result = None
+        for branch in self.branches.values():
+            branch.p_from = branch.q_from = branch.p_to = branch.q_to = None
+            branch.p_loss = branch.q_loss = branch.loading = None
+        self.results = None
+        self.jacobian_factor = None
+
     def restore_original_data(self):
         """ Restaura os dados para o estado original do arquivo. """
         self.buses = copy.deepcopy(self._original_buses)
         self.branches = copy.deepcopy(self._original_branches)
         self.results = None
+        self.jacobian_factor = None
         self.log = ""
+        self.journal.clear()
         print("Dados originais restaurados.")
\ No newline at end of file
@@ -88,23 +88,25 @@ def parse_dbar_line(line: str):
     Interpreta uma linha da seção DBAR com base no formato fixo.
     (Num)OETGb(   nome   )Gl( V)( A)( Pg)( Qg)( Qn)( Qm)(Bc  )( Pl)( Ql)( Sh)Are
     """
-    # Dados da primeira parte da linha
+    # Dados da primeira parte da linha (colunas conforme o cabeçalho acima)
     data = {
         'number': line[0:5].strip(),
-        'type': line[5:8].strip(),
-        'name': line[8:20].strip(),
-        'group': line[20:22].strip(),
-        'voltage': line[22:26].strip(),
-        'angle': line[26:30].strip(),
-        'p_gen': line[30:35].strip(),
-        'q_gen': line[35:40].strip(),
-        'q_min': line[40:45].strip(),
-        'q_max': line[45:50].strip(),
-        'shunt_b': line[50:55].strip(),
-        'p_load': line[55:60].strip(),
-        'q_load': line[60:65].strip(),
-        'shunt_sh': line[65:70].strip(),
-        'area': line[70:73].strip(),
+        'type': line[5:8].strip(), # Operação + Estado (L/D) + Tipo (0/1/2)
+        'state': line[6:7].strip(),
+        'group': line[8:10].strip(), # Grupo de base de tensão
+        'name': line[10:22].strip(),
+        'limit_group': line[22:24].strip(), # Grupo de limite de tensão
+        'voltage': line[24:28].strip(),
+        'angle': line[28:32].strip(),
+        'p_gen': line[32:37].strip(),
+        'q_gen': line[37:42].strip(),
+        'q_min': line[42:47].strip(),
+        'q_max': line[47:52].strip(),
+        'controlled_bus': line[52:58].strip(),
+        'p_load': line[58:63].strip(),
+        'q_load': line[63:68].strip(),
+        'shunt_b': line[68:73].strip(),
+        'area': line[73:76].strip(),
     }
     
     # Se a linha for longa (continuação), tenta extrair dados dela
@@ -127,17 +129,69 @@ def parse_dlin_line(line: str):
     Interpreta uma linha da seção DLIN com base no formato fixo.
     (De )d O d(Pa )NcEPM( R% )( X% )(Mvar)(Tap)(Tmn)(Tmx)(Phs)(Bc  )(Cn)(Ce)Ns(Cq)
     """
+    tap = line[38:43].strip()
     return {
         'from_bus': line[0:5].strip(),
+        'from_opening': line[5:6].strip(), # Abertura na barra De
+        'operation': line[7:8].strip(),
+        'to_opening': line[9:10].strip(), # Abertura na barra Para
         'to_bus': line[10:15].strip(),
         'circuit': line[15:17].strip(),
-        'type': line[17:18].strip(), # 'T' para Transformador
-        'status': line[18:19].strip(),
-        'r': line[21:26].strip(),
+        'type': 'T' if tap else '', # Ramo com tap informado é transformador
+        'state': line[17:18].strip(), # 'D' para desligado
+        'owner': line[18:19].strip(), # Proprietário ('F' ou 'T')
+        'maneuver': line[19:20].strip(), # Manobrável ('N' = não)
+        'r': line[20:26].strip(),
         'x': line[26:32].strip(),
         'shunt_b': line[32:38].strip(),
-        'tap': line[38:43].strip(),
+        'tap': tap,
         'tap_min': line[43:48].strip(),
         'tap_max': line[48:53].strip(),
         'phase': line[53:58].strip(),
-    }
\ No newline at end of file
+        'controlled_bus': line[58:64].strip(), # Barra controlada pelo tap
+        'rating_normal': line[64:68].strip(), # Capacidade normal (MVA)
+        'rating_emergency': line[68:72].strip(), # Capacidade de emergência (MVA)
+        'steps': line[72:74].strip(), # Número de steps do tap
+        'rating_equipment': line[74:78].strip(), # Capacidade do equipamento (MVA)
+    }
+
+def parse_pwf_header(filepath: str):
+    """
+    Leitura rápida (só cabeçalho) de um arquivo .PWF para indexação:
+    título (TITU), número/nome/área das barras (DBAR) e contagem de ramos
+    (DLIN). Não interpreta os demais campos nem as outras seções: a
+    leitura para ao fim da última das seções DBAR e DLIN.
+    """
+    data = {'title': '', 'buses': [], 'n_branches': 0}
+    current_section = None
+    finished = set() # Seções DBAR/DLIN já encerradas
+
+    with open(filepath, 'r', encoding='latin-1') as f:
+        for line in f:
+            if line.startswith('('):
+                continue
+
+            strip_line = line.strip()
+            if not strip_line:
+                continue
+            if strip_line in ('TITU', 'DBAR', 'DLIN'):
+                current_section = strip_line
+                continue
+            if strip_line == '99999':
+                finished.add(current_section)
+                current_section = None
+                if {'DBAR', 'DLIN'} <= finished:
+                    break
+                continue
+            if strip_line == 'FIM':
+                break
+
+            if current_section == 'TITU' and not data['title']:
+                data['title'] = strip_line
+            elif current_section == 'DBAR' and line[0:5].strip().isdigit():
+                area = line[73:76].strip()
+                data['buses'].append((int(line[0:5]), line[10:22].strip(),
+                                      int(area) if area.isdigit() else 0))
+            elif current_section == 'DLIN' and line[0:5].strip().isdigit():
+                data['n_branches'] += 1
+    return data
@@ -0,0 +1,260 @@
+# pwf_writer.py
+import os
+from functools import reduce
+import numpy as np
+from power_system_model import PowerSystem
+
+DBAR_HEADER = "(Num)OETGb(   nome   )Gl( V)( A)( Pg)( Qg)( Qn)( Qm)(Bc  )( Pl)( Ql)( Sh)Are(Vf)"
+DLIN_HEADER = "(De )d O d(Pa )NcEPM( R% )( X% )(Mvar)(Tap)(Tmn)(Tmx)(Phs)(Bc  )(Cn)(Ce)Ns(Cq)"
+
+# Campos numéricos variáveis: {campo: (largura, casas implícitas ou None, branco se zero)}
+BUS_NUMERIC_FIELDS = {
+    'voltage': (4, 3, False),
+    'angle': (4, None, False),
+    'p_gen': (5, None, True),
+    'q_gen': (5, None, True),
+    'q_min': (5, None, True),
+    'q_max': (5, None, True),
+    'p_load': (5, None, True),
+    'q_load': (5, None, True),
+    'shunt_b': (5, None, True),
+}
+BRANCH_NUMERIC_FIELDS = {
+    'r': (6, None, True),
+    'x': (6, None, False),
+    'shunt_b': (6, None, True),
+    'tap': (5, None, True),
+    'tap_min': (5, None, True),
+    'tap_max': (5, None, True),
+    'phase': (5, None, True),
+    'rating_normal': (4, None, True),
+    'rating_emergency': (4, None, True),
+    'rating_equipment': (4, None, True),
+}
+
+def format_text_column(values, width, align='left'):
+    """ Formata uma coluna de texto com largura fixa (trunca o excesso). """
+    column = np.asarray(values, dtype=f'<U{width}')
+    return np.char.ljust(column, width) if align == 'left' else np.char.rjust(column, width)
+
+def format_implicit_column(values, width, decimals):
+    """ Formata uma coluna com ponto decimal implícito (ex: 1.059 -> '1059'). """
+    scaled = np.round(np.asarray(values, dtype=float) * 10 ** decimals).astype(np.int64)
+    return np.char.rjust(np.char.mod('%d', scaled), width)
+
+def format_float_column(values, width, blank_zero=True):
+    """
+    Formata uma coluna de floats no campo de largura fixa com o maior
+    número de casas decimais que couber, sempre com ponto explícito
+    ('828.', '.014', '-25.1'), como lido por parse_pwf_float.
+    Toda a coluna é formatada de uma vez, uma precisão por vez.
+    """
+    values = np.asarray(values, dtype=float)
+    best = np.full(values.shape, '', dtype=f'<U{width + 8}')
+    fits = np.zeros(values.shape, dtype=bool)
+    nonzero = values != 0
+
+    for decimals in range(width - 1, -1, -1):
+        if decimals > 0:
+            text = np.char.rstrip(np.char.mod(f'%.{decimals}f', values), '0')
+        else:
+            text = np.char.mod('%.0f.', values)
+        # Remove o zero à esquerda ('0.014' -> '.014') para ganhar uma casa
+        lengths = np.char.str_len(text)
+        lead = nonzero & np.char.startswith(text, '0.') & (lengths > 2)
+        text = np.where(lead, np.char.lstrip(text, '0'), text)
+        lead_neg = nonzero & np.char.startswith(text, '-0.') & (lengths > 3)
+        text = np.where(lead_neg, np.char.replace(text, '-0.', '-.'), text)
+
+        ok = ~fits & (np.char.str_len(text) <= width)
+        best = np.where(ok, text, best)
+        fits |= ok
+        if fits.all():
+            break
+
+    if not fits.all():
+        # Sem espaço para o ponto: inteiro puro (ex: '-1000' em 5 colunas)
+        text = np.char.mod('%.0f', values)
+        ok = ~fits & (np.char.str_len(text) <= width)
+        best = np.where(ok, text, best)
+        fits |= ok
+        if not fits.all():
+            print(f"Aviso: {np.count_nonzero(~fits)} valores não cabem em {width} colunas e foram truncados.")
+            best = np.where(fits, best, text)
+
+    if blank_zero:
+        best = np.where(nonzero, best, '')
+    return np.char.rjust(best.astype(f'<U{width}'), width)
+
+def _format_numeric(values, spec):
+    width, implicit, blank_zero = spec
+    if implicit is not None:
+        return format_implicit_column(values, width, implicit)
+    return format_float_column(values, width, blank_zero)
+
+def _join_columns(columns):
+    return reduce(np.char.add, columns)
+
+class PwfWriter:
+    """
+    Serializa um PowerSystem nas seções DBAR/DLIN de um .PWF (formato
+    ANAREDE de colunas fixas), com tensões e ângulos resolvidos (quando
+    existirem) e o estado atual (ligado/desligado) de barras e ramos.
+
+    Os valores são guardados em arrays por campo e cada coluna é
+    formatada de uma só vez. As colunas fixas (números, nomes, grupos)
+    são formatadas uma única vez, de modo que exportar muitos cenários
+    só reformata as colunas alteradas em cada um.
+    """
+    def __init__(self, system: PowerSystem):
+        self.title = system.title
+        buses = list(system.buses.values())
+        branches = list(system.branches.values())
+        self.bus_index = {bus.number: i for i, bus in enumerate(buses)}
+        self.branch_index = {br.get_id(): i for i, br in enumerate(branches)}
+
+        # Valores numéricos (tensão/ângulo resolvidos têm prioridade)
+        self.bus_values = {field: np.array([getattr(bus, field) for bus in buses], dtype=float)
+                           for field in BUS_NUMERIC_FIELDS}
+        self.bus_values['voltage'] = np.array(
+            [bus.v_result if bus.v_result is not None else bus.voltage for bus in buses], dtype=float)
+        self.bus_values['angle'] = np.array(
+            [bus.angle_result if bus.angle_result is not None else bus.angle for bus in buses], dtype=float)
+        self.bus_values['status'] = np.array([bus.status for bus in buses], dtype=bool)
+
+        self.branch_values = {field: np.array([getattr(br, field) for br in branches], dtype=float)
+                              for field in BRANCH_NUMERIC_FIELDS}
+        # Tap só é gravado em transformadores
+        is_transformer = np.array([br.is_transformer for br in branches], dtype=bool)
+        self.branch_values['tap'] = np.where(is_transformer, self.branch_values['tap'], 0.0)
+        self.branch_values['status'] = np.array([br.status for br in branches], dtype=bool)
+
+        # Colunas fixas
+        bus_types = [''.join(c for c in bus.type if c.isdigit()) for bus in buses]
+        self._bus_number = format_text_column([str(bus.number) for bus in buses], 5, 'right')
+        self._bus_type = format_text_column(bus_types, 1)
+        self._bus_group = format_text_column([bus.base_group for bus in buses], 2, 'right')
+        self._bus_name = format_text_column([bus.name for bus in buses], 12)
+        self._bus_limit_group = format_text_column([bus.limit_group for bus in buses], 2, 'right')
+        self._bus_controlled = format_text_column([bus.controlled_bus for bus in buses], 6, 'right')
+        self._bus_area = format_text_column([str(bus.area) if bus.area else '' for bus in buses], 3, 'right')
+
+        self._branch_from = format_text_column([str(br.from_bus) for br in branches], 5, 'right')
+        self._branch_to = format_text_column([str(br.to_bus) for br in branches], 5, 'right')
+        self._branch_circuit = format_text_column([str(br.circuit) for br in branches], 2, 'right')
+        self._branch_flags = format_text_column(
+            [f"{br.from_opening:1} {br.operation:1} {br.to_opening:1}" for br in branches], 5)
+        self._branch_owner = format_text_column([br.owner for br in branches], 1)
+        self._branch_maneuver = format_text_column([br.maneuver for br in branches], 1)
+        self._branch_controlled = format_text_column([br.controlled_bus for br in branches], 6, 'right')
+        self._branch_steps = format_text_column([br.steps for br in branches], 2, 'right')
+
+        self._bus_cache = {}
+        self._branch_cache = {}
+
+    def _bus_column(self, field, values):
+        if values is self.bus_values[field]:
+            if field not in self._bus_cache:
+                self._bus_cache[field] = _format_numeric(values, BUS_NUMERIC_FIELDS[field])
+            return self._bus_cache[field]
+        return _format_numeric(values, BUS_NUMERIC_FIELDS[field])
+
+    def _branch_column(self, field, values):
+        if values is self.branch_values[field]:
+            if field not in self._branch_cache:
+                self._branch_cache[field] = _format_numeric(values, BRANCH_NUMERIC_FIELDS[field])
+            return self._branch_cache[field]
+        return _format_numeric(values, BRANCH_NUMERIC_FIELDS[field])
+
+    def _dbar_lines(self, values):
+        n = len(self.bus_index)
+        state = np.where(values['status'], 'L', 'D')
+        col = lambda field: self._bus_column(field, values[field])
+        columns = [
+            self._bus_number, np.full(n, ' '), state, self._bus_type, self._bus_group,
+            self._bus_name, self._bus_limit_group, col('voltage'), col('angle'),
+            col('p_gen'), col('q_gen'), col('q_min'), col('q_max'), self._bus_controlled,
+            col('p_load'), col('q_load'), col('shunt_b'), self._bus_area,
+        ]
+        return _join_columns(columns) if n else np.array([], dtype=str)
+
+    def _dlin_lines(self, values):
+        n = len(self.branch_index)
+        state = np.where(values['status'], ' ', 'D')
+        col = lambda field: self._branch_column(field, values[field])
+        columns = [
+            self._branch_from, self._branch_flags, self._branch_to, self._branch_circuit,
+            state, self._branch_owner, self._branch_maneuver, col('r'), col('x'), col('shunt_b'),
+            col('tap'), col('tap_min'), col('tap_max'), col('phase'), self._branch_controlled,
+            col('rating_normal'), col('rating_emergency'), self._branch_steps, col('rating_equipment'),
+        ]
+        return _join_columns(columns) if n else np.array([], dtype=str)
+
+    def render(self, bus_values=None, branch_values=None, title=None):
+        """ Gera o texto do .PWF para os valores dados (padrão: os do sistema). """
+        dbar = self._dbar_lines(bus_values or self.bus_values)
+        dlin = self._dlin_lines(branch_values or self.branch_values)
+        parts = [
+            "(",
+            "( Gravacao de .PWF - fluxy",
+            "(",
+            "TITU",
+            title or self.title,
+            "DBAR",
+            DBAR_HEADER,
+            *np.char.rstrip(dbar).tolist(),
+            "99999",
+            "DLIN",
+            DLIN_HEADER,
+            *np.char.rstrip(dlin).tolist(),
+            "99999",
+            "FIM",
+        ]
+        return "\n".join(parts) + "\n"
+
+    def write(self, filepath, bus_values=None, branch_values=None, title=None):
+        with open(filepath, 'w', encoding='latin-1', errors='replace') as f:
+            f.write(self.render(bus_values, branch_values, title))
+
+    def apply_changes(self, changes):
+        """
+        Retorna cópias dos arrays de valores com as alterações de um cenário
+        ({"buses": {num: {campo: valor}}, "branches": {id: {campo: valor}}}).
+        Só os campos alterados são copiados; os demais continuam em cache.
+        """
+        bus_values = dict(self.bus_values)
+        branch_values = dict(self.branch_values)
+        for bus_num, fields in (changes or {}).get('buses', {}).items():
+            i = self.bus_index[int(bus_num)]
+            for field, value in fields.items():
+                if bus_values[field] is self.bus_values[field]:
+                    bus_values[field] = bus_values[field].copy()
+                bus_values[field][i] = value
+        for br_id, fields in (changes or {}).get('branches', {}).items():
+            i = self.branch_index[br_id]
+            for field, value in fields.items():
+                if branch_values[field] is self.branch_values[field]:
+                    branch_values[field] = branch_values[field].copy()
+                branch_values[field][i] = value
+        return bus_values, branch_values
+
+def write_pwf(system: PowerSystem, filepath: str):
+    """ Grava o sistema (com resultados, se houver) em um arquivo .PWF. """
+    PwfWriter(system).write(filepath)
+
+def export_scenarios(system: PowerSystem, scenarios, output_dir: str):
+    """
+    Exporta variantes do caso, uma por arquivo, à medida que são
+    consumidas de scenarios (iterável de (nome, alterações)). Pode ser um
+    gerador, de modo que milhares de cenários não precisam estar em memória.
+    Retorna o número de arquivos gravados.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    writer = PwfWriter(system)
+    count = 0
+    for name, changes in scenarios:
+        bus_values, branch_values = writer.apply_changes(changes)
+        writer.write(os.path.join(output_dir, f"{name}.PWF"), bus_values, branch_values,
+                     title=f"{system.title} - {name}")
+        count += 1
+    return count
@@ -0,0 +1,97 @@
+# sensitivity.py
+import numpy as np
+from scipy.sparse.linalg import splu
+from power_system_model import PowerSystem, INVALIDATES_TOPOLOGY, INVALIDATES_YBUS
+import solvers
+
+class SensitivityAnalyzer:
+    """
+    Sensibilidades de tensão no ponto de operação convergido:
+    dV/dQ, dV/dP e dθ/dP (pu/pu) para as barras selecionadas.
+
+    Reaproveita a fatoração da Jacobiana do último Newton-Raphson
+    (system.jacobian_factor) e resolve apenas as colunas pedidas de
+    J^-1, sem formar a inversa densa. As colunas ficam em cache até que
+    o estado do sistema mude (nova solução).
+    """
+    def __init__(self, system: PowerSystem, ybus, bus_map):
+        self.system = system
+        self.ybus = ybus
+        self.bus_map = bus_map
+        self._state = None
+        self._columns = {} # {('P'|'Q', índice da barra): coluna de J^-1}
+
+    def _refresh(self):
+        """ Recarrega a fatoração se o ponto de operação mudou. """
+        if self.system.journal.pending & {INVALIDATES_TOPOLOGY, INVALIDATES_YBUS}:
+            # Ybus, bus_map e fatoração são da rede anterior às alterações
+            raise ValueError("A rede foi alterada desde o último cálculo; recalcule o fluxo de potência.")
+        if self._state is not None and self._state is self.system.jacobian_factor:
+            return
+
+        if self.system.jacobian_factor is None:
+            # Sem fatoração disponível (ex: solução vinda do cache): fatora no ponto atual
+            V = solvers.get_result_voltage(self.system, self.bus_map)
+            if V is None:
+                raise ValueError("O sistema não possui um ponto de operação resolvido.")
+            _, pv, pq = solvers.get_bus_types(self.system, self.bus_map)
+            pvpq = np.r_[pv, pq]
+            lu = splu(solvers.build_jacobian(self.ybus, V, pvpq, pq))
+            self.system.jacobian_factor = (lu, pvpq, pq)
+
+        self._state = self.system.jacobian_factor
+        self._lu, pvpq, pq = self._state
+        self._n_pvpq = len(pvpq)
+        self._pvpq = pvpq
+        self._pq = pq
+        self._p_row = {idx: row for row, idx in enumerate(pvpq)}
+        self._q_row = {idx: self._n_pvpq + row for row, idx in enumerate(pq)}
+        self._columns.clear()
+
+    def _solve_columns(self, kind, bus_numbers):
+        """ Retorna as colunas de J^-1 para injeção P ou Q nas barras dadas. """
+        self._refresh()
+        rows = self._p_row if kind == 'P' else self._q_row
+        indices = [self.bus_map[num] for num in bus_numbers]
+        for idx in indices:
+            if idx not in rows:
+                tipo = "PV/PQ" if kind == 'P' else "PQ"
+                raise ValueError(f"Sensibilidade a {kind} só é definida para barras {tipo}.")
+
+        # Resolve de uma vez só as colunas que ainda não estão em cache
+        missing = [idx for idx in dict.fromkeys(indices) if (kind, idx) not in self._columns]
+        if missing:
+            rhs = np.zeros((self._lu.shape[0], len(missing)))
+            for col, idx in enumerate(missing):
+                rhs[rows[idx], col] = 1.0
+            solution = self._lu.solve(rhs)
+            for col, idx in enumerate(missing):
+                self._columns[(kind, idx)] = solution[:, col]
+
+        return np.column_stack([self._columns[(kind, idx)] for idx in indices])
+
+    def _expand(self, columns, part):
+        """ Espalha as linhas de ângulo ou tensão para todas as barras (0 nas fixas). """
+        result = np.zeros((len(self.bus_map), columns.shape[1]))
+        if part == 'angle':
+            result[self._pvpq] = columns[:self._n_pvpq]
+        else:
+            result[self._pq] = columns[self._n_pvpq:]
+        return result
+
+    def dv_dq(self, bus_numbers):
+        """ Matriz (barras x selecionadas) de dV/dQ, linhas na ordem do bus_map. """
+        return self._expand(self._solve_columns('Q', bus_numbers), 'magnitude')
+
+    def dv_dp(self, bus_numbers):
+        """ Matriz (barras x selecionadas) de dV/dP, linhas na ordem do bus_map. """
+        return self._expand(self._solve_columns('P', bus_numbers), 'magnitude')
+
+    def dtheta_dp(self, bus_numbers):
+        """ Matriz (barras x selecionadas) de dθ/dP (rad/pu), linhas na ordem do bus_map. """
+        return self._expand(self._solve_columns('P', bus_numbers), 'angle')
+
+    def self_dv_dq(self, bus_numbers):
+        """ Sensibilidades próprias dVi/dQi: valores altos indicam barras fracas. """
+        matrix = self.dv_dq(bus_numbers)
+        return {num: float(matrix[self.bus_map[num], col]) for col, num in enumerate(bus_numbers)}
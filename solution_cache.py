@@ -0,0 +1,102 @@
+# solution_cache.py
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from power_system_model import PowerSystem
+import solvers
+
+def get_topology_key(system: PowerSystem, bus_map):
+    """
+    Hash da rede ativa: conjunto de barras e ramos ligados e seus
+    parâmetros elétricos (tudo o que entra na Ybus).
+    """
+    h = hashlib.sha1()
+    for bus_num in sorted(bus_map):
+        bus = system.buses[bus_num]
+        h.update(f"B{bus_num}|{bus.type}|{bus.shunt_b!r};".encode())
+    for br_id in sorted(system.branches):
+        br = system.branches[br_id]
+        if br.status and br.from_bus in bus_map and br.to_bus in bus_map:
+            h.update(f"L{br_id}|{br.r!r}|{br.x!r}|{br.shunt_b!r}|{br.tap!r};".encode())
+    return h.hexdigest()
+
+def get_injection_state(system: PowerSystem, bus_map):
+    """
+    Vetor real com o estado de injeções (P, Q especificados), os módulos
+    de tensão especificados e os ângulos das barras de referência (graus),
+    na ordem do bus_map.
+    """
+    s_spec = solvers.get_bus_injections(system, bus_map)
+    v_spec = np.zeros(len(bus_map))
+    angle = np.zeros(len(bus_map))
+    for bus_num, idx in bus_map.items():
+        v_spec[idx] = system.buses[bus_num].voltage
+        angle[idx] = system.buses[bus_num].angle
+    # Nas demais barras o ângulo é só estimativa inicial e não muda a solução
+    ref, _, _ = solvers.get_bus_types(system, bus_map)
+    angle_ref = np.zeros(len(bus_map))
+    angle_ref[ref] = angle[ref]
+    return np.r_[s_spec.real, s_spec.imag, v_spec, angle_ref]
+
+class SolutionCache:
+    """
+    Armazena soluções convergidas indexadas por topologia e estado de
+    injeções, com descarte LRU (no máximo max_entries soluções).
+
+    lookup() devolve a solução exata se o caso já foi calculado, ou a
+    solução mais próxima com a mesma topologia para partida a quente.
+    """
+    def __init__(self, max_entries=32, tolerance=1e-9):
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self._entries = OrderedDict() # {(topologia, estado): (vetor de estado, V)}
+
+    def _make_key(self, topology, state):
+        # Arredonda para que pequenos ruídos numéricos não gerem chaves distintas
+        return topology, np.round(state / self.tolerance).astype(np.int64).tobytes()
+
+    def lookup(self, system: PowerSystem, bus_map):
+        """
+        Retorna (exato, V). exato=True indica caso idêntico já resolvido;
+        caso contrário V é a solução mais próxima (ou None, se não houver).
+        """
+        topology = get_topology_key(system, bus_map)
+        state = get_injection_state(system, bus_map)
+
+        key = self._make_key(topology, state)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return True, self._entries[key][1].copy()
+
+        best_key, best_dist = None, np.inf
+        for entry_key, (entry_state, _) in self._entries.items():
+            if entry_key[0] != topology:
+                continue
+            dist = np.linalg.norm(entry_state - state)
+            if dist < best_dist:
+                best_key, best_dist = entry_key, dist
+
+        if best_key is None:
+            return False, None
+        self._entries.move_to_end(best_key)
+        return False, self._entries[best_key][1].copy()
+
+    def store(self, system: PowerSystem, bus_map):
+        """ Guarda a solução atual do sistema (se todas as barras tiverem resultado). """
+        V = solvers.get_result_voltage(system, bus_map)
+        if V is None:
+            return False
+
+        state = get_injection_state(system, bus_map)
+        key = self._make_key(get_topology_key(system, bus_map), state)
+        self._entries[key] = (state, V)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
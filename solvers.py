@@ -1,11 +1,16 @@
 # solvers.py
 import numpy as np
 import scipy.sparse as sparse
+from scipy.sparse.linalg import splu
 from power_system_model import PowerSystem
 
+BASE_MVA = 100.0 # Potência base do sistema (MVA)
+
 def build_ybus(system: PowerSystem):
     """
-    Constrói a matriz de admitância (Ybus) do sistema.
+    Constrói a matriz de admitância (Ybus) do sistema, em pu.
+    Os dados do PWF (R% e X% de ramos, shunts em Mvar) são convertidos
+    para pu na base BASE_MVA.
     
     NOTA: Esta é uma versão simplificada. Ela não trata
     corretamente transformadores defasadores ou com taps complexos.
@@ -36,34 +41,186 @@ def build_ybus(system: PowerSystem):
         i = bus_map[branch.from_bus]
         j = bus_map[branch.to_bus]
         
-        # Admitância série
-        y_series = 1 / (branch.r + 1j * branch.x)
-        
-        # Admitância shunt (dividida por 2, p/ modelo PI)
-        y_shunt = 1j * branch.shunt_b
-        
         # TODO: Implementar lógica de TAP do transformador
         # tap = branch.tap if branch.is_transformer else 1.0
         # ... lógica mais complexa aqui ...
-        
-        # Elementos fora da diagonal (Yij)
-        Ybus[i, j] -= y_series
-        Ybus[j, i] -= y_series
-        
-        # Elementos da diagonal (Yii)
-        Ybus[i, i] += y_series + (y_shunt / 2)
-        Ybus[j, j] += y_series + (y_shunt / 2)
+        stamp_branch(Ybus, i, j, branch.r, branch.x, branch.shunt_b)
 
     # 2. Adicionar shunts das barras (DBAR)
     for bus in active_buses.values():
         if bus.shunt_b != 0:
             idx = bus_map[bus.number]
-            Ybus[idx, idx] += 1j * bus.shunt_b
+            Ybus[idx, idx] += 1j * bus.shunt_b / BASE_MVA
             
     # Converter para formato CSC (Compressed Sparse Column) para cálculos rápidos
     return Ybus.tocsc(), bus_map
 
-def solve_gauss_seidel(system: PowerSystem, ybus, bus_map, max_iter=100, tolerance=1e-5):
+def get_branch_admittance(r, x, shunt_b):
+    """
+    Converte os dados de ramo do PWF (R%, X%, shunt total em Mvar) para
+    pu. Retorna (admitância série, admitância shunt total).
+    """
+    return 1 / ((r + 1j * x) / 100), 1j * shunt_b / BASE_MVA
+
+def stamp_branch(ybus, i, j, r, x, shunt_b, sign=1):
+    """
+    Soma (sign=1) ou retira (sign=-1) a estampa PI de um ramo na Ybus.
+    r, x e shunt_b nas unidades do PWF (%, % e Mvar).
+    """
+    y_series, y_shunt = get_branch_admittance(r, x, shunt_b)
+
+    # Elementos fora da diagonal (Yij)
+    ybus[i, j] -= sign * y_series
+    ybus[j, i] -= sign * y_series
+
+    # Elementos da diagonal (Yii)
+    ybus[i, i] += sign * (y_series + y_shunt / 2)
+    ybus[j, j] += sign * (y_series + y_shunt / 2)
+
+def update_ybus(ybus, bus_map, system: PowerSystem, previous):
+    """
+    Atualiza a Ybus só nas estampas dos elementos alterados, sem mudança
+    de topologia (mesmo bus_map e mesmos ramos ligados).
+    previous: {('bus'|'branch', chave): {campo: valor usado na Ybus atual}},
+    como retornado por EditJournal.take_pending().
+    Retorna uma nova matriz; a original não é modificada.
+    """
+    ybus = ybus.tolil()
+    for (target, key), fields in previous.items():
+        if target == 'bus' and 'shunt_b' in fields and key in bus_map:
+            idx = bus_map[key]
+            ybus[idx, idx] += 1j * (system.buses[key].shunt_b - fields['shunt_b']) / BASE_MVA
+        elif target == 'branch':
+            branch = system.branches[key]
+            if not branch.status or branch.from_bus not in bus_map or branch.to_bus not in bus_map:
+                continue
+            i, j = bus_map[branch.from_bus], bus_map[branch.to_bus]
+            old = {'r': branch.r, 'x': branch.x, 'shunt_b': branch.shunt_b}
+            old.update((f, v) for f, v in fields.items() if f in old)
+            stamp_branch(ybus, i, j, old['r'], old['x'], old['shunt_b'], sign=-1)
+            stamp_branch(ybus, i, j, branch.r, branch.x, branch.shunt_b)
+    return ybus.tocsc()
+
+def build_branch_admittances(system: PowerSystem, bus_map):
+    """
+    Constrói as matrizes de admitância de ramo Yf e Yt (uma linha por ramo
+    ligado), com o mesmo modelo PI usado em build_ybus, de modo que
+    If = Yf * V e It = Yt * V. Retorna (Yf, Yt, índices das barras DE,
+    índices das barras PARA, lista de IDs dos ramos).
+    """
+    branches = [br for br in system.branches.values()
+                if br.status and br.from_bus in bus_map and br.to_bus in bus_map]
+    n_br = len(branches)
+    f = np.array([bus_map[br.from_bus] for br in branches], dtype=int)
+    t = np.array([bus_map[br.to_bus] for br in branches], dtype=int)
+    y_series, y_shunt = get_branch_admittance(np.array([br.r for br in branches], dtype=float),
+                                              np.array([br.x for br in branches], dtype=float),
+                                              np.array([br.shunt_b for br in branches], dtype=float))
+    y_shunt = y_shunt / 2
+
+    rows = np.r_[np.arange(n_br), np.arange(n_br)]
+    shape = (n_br, len(bus_map))
+    yf = sparse.csr_matrix((np.r_[y_series + y_shunt, -y_series], (rows, np.r_[f, t])), shape=shape)
+    yt = sparse.csr_matrix((np.r_[-y_series, y_series + y_shunt], (rows, np.r_[f, t])), shape=shape)
+    return yf, yt, f, t, [br.get_id() for br in branches]
+
+def get_bus_injections(system: PowerSystem, bus_map):
+    """
+    Retorna o vetor de injeções líquidas especificadas (Pg - Pl + j(Qg - Ql))
+    em pu, na mesma ordem de índices do bus_map.
+    """
+    s_inj = np.zeros(len(bus_map), dtype=complex)
+    for bus_num, idx in bus_map.items():
+        bus = system.buses[bus_num]
+        s_inj[idx] = complex(bus.p_gen - bus.p_load, bus.q_gen - bus.q_load)
+    return s_inj / BASE_MVA
+
+def get_bus_types(system: PowerSystem, bus_map):
+    """
+    Classifica as barras pelo código de tipo do ANAREDE (2 = Vθ, 1 = PV,
+    vazio/0 = PQ). Retorna os índices (ref, pv, pq) como arrays ordenados.
+    """
+    ref, pv, pq = [], [], []
+    for bus_num, idx in bus_map.items():
+        bus_type = system.buses[bus_num].type
+        if '2' in bus_type:
+            ref.append(idx)
+        elif '1' in bus_type:
+            pv.append(idx)
+        else:
+            pq.append(idx)
+
+    # Sem barra de referência (ex: rede parcial): usa a primeira PV ou PQ
+    if not ref:
+        ref.append(pv.pop(0) if pv else pq.pop(0))
+        print("Aviso: Nenhuma barra Vθ encontrada. Usando a barra de índice "
+              f"{ref[0]} como referência.")
+
+    return np.array(sorted(ref), dtype=int), np.array(sorted(pv), dtype=int), np.array(sorted(pq), dtype=int)
+
+def get_initial_voltage(system: PowerSystem, bus_map, v0=None):
+    """
+    Monta o vetor de tensões complexas inicial. Sem v0, usa os valores do
+    arquivo (V, Ângulo). Com v0 (partida a quente), usa v0 mas mantém o
+    módulo especificado nas barras de referência e PV.
+    """
+    v_spec = np.zeros(len(bus_map))
+    v_init = np.zeros(len(bus_map), dtype=complex)
+    for bus_num, idx in bus_map.items():
+        bus = system.buses[bus_num]
+        v_spec[idx] = bus.voltage
+        v_init[idx] = bus.voltage * np.exp(1j * np.radians(bus.angle))
+
+    if v0 is None:
+        return v_init
+
+    ref, pv, _ = get_bus_types(system, bus_map)
+    V = np.array(v0, dtype=complex)
+    fixed = np.r_[ref, pv]
+    V[fixed] = v_spec[fixed] * V[fixed] / np.abs(V[fixed])
+    return V
+
+def build_jacobian(ybus, V, pvpq, pq):
+    """
+    Monta a matriz Jacobiana esparsa [H N; M L] na forma polar,
+    a partir das derivadas de S = V * conj(Ybus * V).
+    """
+    i_bus = ybus @ V
+    diag_v = sparse.diags(V)
+    diag_i = sparse.diags(i_bus)
+    diag_vnorm = sparse.diags(V / np.abs(V))
+
+    ds_dva = 1j * diag_v @ np.conj(diag_i - ybus @ diag_v)
+    ds_dvm = diag_v @ np.conj(ybus @ diag_vnorm) + np.conj(diag_i) @ diag_vnorm
+
+    ds_dva = ds_dva.tocsr()
+    ds_dvm = ds_dvm.tocsr()
+    h = ds_dva[pvpq, :][:, pvpq].real
+    n = ds_dvm[pvpq, :][:, pq].real
+    m = ds_dva[pq, :][:, pvpq].imag
+    l = ds_dvm[pq, :][:, pq].imag
+    return sparse.bmat([[h, n], [m, l]], format='csc')
+
+def store_voltage_results(system: PowerSystem, bus_map, V):
+    """ Grava o vetor de tensões complexas nos resultados das barras. """
+    for bus_num, idx in bus_map.items():
+        bus = system.buses[bus_num]
+        bus.v_result = float(np.abs(V[idx]))
+        bus.angle_result = float(np.degrees(np.angle(V[idx])))
+    # Nova solução: a fatoração guardada (se houver) é de outro ponto de operação
+    system.jacobian_factor = None
+
+def get_result_voltage(system: PowerSystem, bus_map):
+    """ Retorna o vetor de tensões complexas resolvido, ou None se faltar resultado. """
+    V = np.zeros(len(bus_map), dtype=complex)
+    for bus_num, idx in bus_map.items():
+        bus = system.buses[bus_num]
+        if bus.v_result is None or bus.angle_result is None:
+            return None
+        V[idx] = bus.v_result * np.exp(1j * np.radians(bus.angle_result))
+    return V
+
+def solve_gauss_seidel(system: PowerSystem, ybus, bus_map, max_iter=100, tolerance=1e-5, v0=None):
     """
     Executa o solver Gauss-Seidel.
     Baseado na Equação (20) de "Anotações 20102025.pdf".
@@ -72,7 +229,7 @@ def solve_gauss_seidel(system: PowerSystem, ybus, bus_map, max_iter=100, toleran
     print(log.strip())
     
     # TODO: Implementar o loop iterativo de Gauss-Seidel
-    # 1. Inicializar V com valores das barras
+    # 1. Inicializar V com valores das barras (ou v0, se fornecido)
     # 2. Iterar k = 1 to max_iter:
     # 3.   Para cada barra PQ e PV:
     # 4.     Calcular Vk(i+1) usando a Eq. (20)
@@ -87,41 +244,75 @@ def solve_gauss_seidel(system: PowerSystem, ybus, bus_map, max_iter=100, toleran
     system.log = log
     return True # Sucesso (simulado)
 
-def solve_newton_raphson(system: PowerSystem, ybus, bus_map, max_iter=20, tolerance=1e-5):
+def solve_newton_raphson(system: PowerSystem, ybus, bus_map, max_iter=20, tolerance=1e-5, v0=None,
+                         callback=None):
     """
-    Executa o solver Newton-Raphson.
+    Executa o solver Newton-Raphson (formulação polar).
     Baseado nas equações do "Exemplo Fluxo.pdf" (pág 31+).
+    v0: vetor de tensões complexas para partida a quente (opcional).
+    callback: chamado a cada iteração como callback(k, V, mismatch), com o
+    mismatch complexo por barra (pu, zero onde a grandeza não é especificada).
+    Deve ser rápido; não altere os arrays.
     """
     log = "Iniciando Solver Newton-Raphson...\n"
     print(log.strip())
 
-    # TODO: Implementar o loop iterativo de Newton-Raphson
-    # 1. Inicializar V e Ângulo
-    # 2. Iterar k = 1 to max_iter:
-    # 3.   Calcular Mismatch (dP, dQ)
-    # 4.   Verificar convergência (max(dP, dQ) < tolerance)
-    # 5.   Construir Matriz Jacobiana (H, N, M, L)
-    # 6.   Resolver sistema linear: J * [dAngle, dV] = [dP, dQ]
-    # 7.   Atualizar V e Ângulo: V = V + dV, Angle = Angle + dAngle
-    # 8. Atualizar system.buses com resultados
-    
-    # Exemplo de resultado simulado (baseado no "Exemplo Fluxo.pdf" Caso 1)
-    if 5 in bus_map: 
-        system.buses[454].v_result = 0.994
-        system.buses[454].angle_result = -41.380
-    
-    log += f"Iteração 1: Max Mismatch = 150.0 MW\n"
-    log += f"Iteração 2: Max Mismatch = 25.5 MW\n"
-    log += f"Iteração 3: Max Mismatch = 3.1 MW\n"
-    log += f"Iteração 4: Max Mismatch = 0.2 MW\n"
-    log += f"Iteração 5: Max Mismatch = 0.001 MW\n"
-    log += f"Solver (Newton-Raphson) convergiu em 5 iterações (simulado).\n"
-    
+    ref, pv, pq = get_bus_types(system, bus_map)
+    pvpq = np.r_[pv, pq]
+    n_pvpq = len(pvpq)
+    s_spec = get_bus_injections(system, bus_map)
+
+    V = get_initial_voltage(system, bus_map, v0)
+    v_ang = np.angle(V)
+    v_mag = np.abs(V)
+
+    converged = False
+    lu = None
+    for k in range(max_iter + 1):
+        # Mismatch de potência (dP nas barras PV e PQ, dQ nas barras PQ)
+        mismatch = V * np.conj(ybus @ V) - s_spec
+        f = np.r_[mismatch.real[pvpq], mismatch.imag[pq]]
+        max_mismatch = np.max(np.abs(f)) if len(f) else 0.0
+        if callback:
+            # Só as grandezas especificadas (sem a referência e sem Q nas PV)
+            specified = np.zeros(len(V), dtype=complex)
+            specified[pvpq] = mismatch.real[pvpq]
+            specified[pq] += 1j * mismatch.imag[pq]
+            callback(k, V, specified)
+        log += f"Iteração {k}: Max Mismatch = {max_mismatch * BASE_MVA:.4f} MW/MVAr\n"
+
+        if max_mismatch < tolerance:
+            converged = True
+            break
+        if k == max_iter:
+            break
+
+        # Resolve J * [dAngle, dV] = -mismatch
+        jac = build_jacobian(ybus, V, pvpq, pq)
+        try:
+            lu = splu(jac)
+        except RuntimeError as e:
+            # Jacobiana singular (ex: barra ilhada por uma contingência)
+            system.log = log + f"Solver (Newton-Raphson) interrompido: Jacobiana singular ({e}).\n"
+            return False
+        dx = lu.solve(-f)
+        v_ang[pvpq] += dx[:n_pvpq]
+        v_mag[pq] += dx[n_pvpq:]
+        V = v_mag * np.exp(1j * v_ang)
+
     system.log = log
-    system.results = "Concluído (Simulado)"
-    return True # Sucesso (simulado)
+    if not converged:
+        system.log += f"Solver (Newton-Raphson) não convergiu em {max_iter} iterações.\n"
+        return False
+
+    store_voltage_results(system, bus_map, V)
+    # Guarda a última fatoração da Jacobiana (reuso em análises de sensibilidade)
+    system.jacobian_factor = (lu, pvpq, pq) if lu is not None else None
+    system.log += f"Solver (Newton-Raphson) convergiu em {k} iterações.\n"
+    system.results = "Concluído"
+    return True
 
-def solve_gauss_jacobi(system: PowerSystem, ybus, bus_map, max_iter=100, tolerance=1e-5):
+def solve_gauss_jacobi(system: PowerSystem, ybus, bus_map, max_iter=100, tolerance=1e-5, v0=None):
     """
     Executa o solver Gauss (Jacobi).
     Baseado na Equação (18) de "Anotações 20102025.pdf".
@@ -137,4 +328,158 @@ def solve_gauss_jacobi(system: PowerSystem, ybus, bus_map, max_iter=100, toleran
     log += f"Convergência não implementada.\n"
     
     system.log = log
-    return True # Sucesso (simulado)
\ No newline at end of file
+    return True # Sucesso (simulado)
+
+def evaluate_pade(coefficients):
+    """
+    Avalia em s = 1 a aproximante de Padé diagonal [L/L] das séries de
+    potência dadas (coefficients: termos x barras), todas de uma vez.
+    Usa o maior L possível (2L + 1 <= nº de termos).
+    """
+    n_terms, n_bus = coefficients.shape
+    order = (n_terms - 1) // 2
+    if order == 0:
+        return coefficients.sum(axis=0)
+    c = coefficients.T # barras x termos
+
+    # Denominador (b0 = 1): sum_j b_j c[L + i - j] = -c[L + i], i, j = 1..L
+    i = np.arange(1, order + 1)
+    idx = order + i[:, None] - i[None, :]
+    toeplitz = c[:, idx] # barras x L x L
+    rhs = -c[:, order + 1:2 * order + 1]
+    try:
+        b = np.linalg.solve(toeplitz, rhs[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        # Alguma série já terminou (ex: termos nulos): resolve barra a barra
+        b = np.array([np.linalg.lstsq(toeplitz[k], rhs[k], rcond=None)[0] for k in range(n_bus)])
+    b = np.c_[np.ones(n_bus), b]
+
+    # Numerador: a_m = sum_{j <= m} b_j c[m - j], m = 0..L
+    a = np.zeros((n_bus, order + 1), dtype=c.dtype)
+    for m in range(order + 1):
+        a[:, m] = np.sum(b[:, :m + 1] * c[:, m::-1], axis=1)
+    return a.sum(axis=1) / b.sum(axis=1)
+
+def solve_helm(system: PowerSystem, ybus, bus_map, max_terms=60, tolerance=1e-5, max_stall=5,
+               callback=None):
+    """
+    Fluxo de potência pelo método de imersão holomórfica (HELM).
+
+    As tensões são escritas como séries de potência V(s) = sum V[n] s^n,
+    partindo do estado germe sem carga (V = 1 em s = 0). Cada termo sai de
+    um sistema linear com a mesma matriz (parte série da Ybus, real e
+    imaginária separadas, com as incógnitas Q das barras PV), fatorada uma
+    única vez. A solução (s = 1) é obtida pela aproximante de Padé das
+    séries, reavaliada a cada dois termos até o mismatch ficar abaixo da
+    tolerância. Não depende de estimativa inicial.
+
+    max_terms: comprimento máximo das séries.
+    max_stall: avaliações seguidas sem melhorar o menor mismatch após as
+    quais as séries são consideradas divergentes (caso sem solução).
+    callback: como em solve_newton_raphson, a cada avaliação de Padé.
+    """
+    log = "Iniciando Solver HELM (imersão holomórfica)...\n"
+    print(log.strip())
+
+    n = len(bus_map)
+    ref, pv, pq = get_bus_types(system, bus_map)
+    pvpq = np.r_[pv, pq]
+    s_spec = get_bus_injections(system, bus_map)
+    v_spec = get_initial_voltage(system, bus_map)
+    pv_mag2 = np.abs(v_spec[pv]) ** 2
+
+    # Ybus = Yserie + diag(yshunt); as linhas de Yserie somam zero
+    y_shunt = np.asarray(ybus.sum(axis=1)).ravel()
+    y_series = (ybus - sparse.diags(y_shunt)).tocsc()
+    y_nn = y_series[pvpq, :][:, pvpq]
+    y_ns = y_series[pvpq, :][:, ref]
+    g, b = y_nn.real, y_nn.imag
+
+    # Incógnitas por termo: [Re V (PQ), Im V (PV+PQ), Q (PV)]
+    # Equações: [Re; Im] de Yserie * V[n] = termos conhecidos
+    n_pv = len(pv)
+    pq_cols = np.arange(n_pv, len(pvpq))
+    pv_cols = np.arange(n_pv)
+    q_select = sparse.csc_matrix((np.ones(n_pv), (pv_cols, pv_cols)), shape=(len(pvpq), n_pv))
+    matrix = sparse.bmat([[g[:, pq_cols], -b, None],
+                          [b[:, pq_cols], g, q_select]], format='csc')
+    try:
+        lu = splu(matrix)
+    except RuntimeError as e:
+        # Matriz singular (ex: barra ilhada por uma contingência)
+        system.log = log + f"Solver (HELM) interrompido: matriz singular ({e}).\n"
+        return False
+
+    V = np.zeros((max_terms, n), dtype=complex) # Coeficientes das tensões
+    W = np.zeros((max_terms, n), dtype=complex) # Coeficientes de 1 / conj(V)
+    Q = np.zeros((max_terms, n_pv)) # Coeficientes da injeção reativa nas PV
+    V[0] = 1.0
+    W[0] = 1.0
+
+    converged = False
+    v_sol = V[0]
+    max_mismatch = np.inf
+    best_mismatch = np.inf
+    stall = 0 # Avaliações seguidas acima do menor mismatch
+    for k in range(1, max_terms):
+        # Barras de referência: V(s) = 1 + s (Vesp - 1)
+        if k == 1:
+            V[1, ref] = v_spec[ref] - 1.0
+
+        rhs = np.conj(s_spec[pvpq]) * W[k - 1, pvpq] - y_shunt[pvpq] * V[k - 1, pvpq]
+        # PV: P * W[k-1] - j sum_{m=1}^{k-1} Q[m] W[k-m] (Q[k] é incógnita)
+        rhs[:n_pv] = (s_spec[pv].real * W[k - 1, pv] - y_shunt[pv] * V[k - 1, pv]
+                      - 1j * np.sum(Q[1:k] * W[k - 1:0:-1, pv], axis=0))
+        rhs -= y_ns @ V[k, ref]
+
+        # PV: |V(s)|^2 = 1 + s (|Vesp|^2 - 1) fixa a parte real de V[k]
+        re_pv = -0.5 * np.sum(V[1:k, pv] * np.conj(V[k - 1:0:-1, pv]), axis=0).real
+        if k == 1:
+            re_pv += 0.5 * (pv_mag2 - 1.0)
+        known = g[:, pv_cols] @ re_pv, b[:, pv_cols] @ re_pv
+        x = lu.solve(np.r_[rhs.real - known[0], rhs.imag - known[1]])
+
+        n_pq = len(pq)
+        V[k, pv] = re_pv + 1j * x[n_pq:n_pq + n_pv]
+        V[k, pq] = x[:n_pq] + 1j * x[n_pq + n_pv:n_pq + len(pvpq)]
+        Q[k] = x[n_pq + len(pvpq):]
+        W[k] = -np.sum(W[:k] * np.conj(V[k:0:-1]), axis=0)
+
+        # Avalia a solução com Padé a cada dois termos (aproximante diagonal)
+        if k % 2 == 0:
+            v_sol = evaluate_pade(V[:k + 1])
+            mismatch = v_sol * np.conj(ybus @ v_sol) - s_spec
+            f = np.r_[mismatch.real[pvpq], mismatch.imag[pq]]
+            max_mismatch = np.max(np.abs(f)) if len(f) else 0.0
+            if callback:
+                specified = np.zeros(n, dtype=complex)
+                specified[pvpq] = mismatch.real[pvpq]
+                specified[pq] += 1j * mismatch.imag[pq]
+                callback(k, v_sol, specified)
+            log += f"Termos {k + 1}: Max Mismatch = {max_mismatch * BASE_MVA:.4f} MW/MVAr\n"
+            if max_mismatch < tolerance:
+                converged = True
+                break
+            if not np.isfinite(max_mismatch):
+                break # Séries divergentes (sem solução ou mal condicionado)
+
+            # Perto do limite o mismatch oscila; só desiste se não melhorar por várias avaliações
+            if max_mismatch < best_mismatch:
+                best_mismatch, stall = max_mismatch, 0
+            else:
+                stall += 1
+                if stall >= max_stall:
+                    log += (f"Mismatch sem melhora há {stall} avaliações "
+                            f"(menor: {best_mismatch * BASE_MVA:.4f} MW/MVAr).\n")
+                    break
+
+    system.log = log
+    if not converged:
+        system.log += (f"Solver (HELM) não convergiu com {k + 1} termos "
+                       f"(caso possivelmente sem solução).\n")
+        return False
+
+    store_voltage_results(system, bus_map, v_sol)
+    system.log += f"Solver (HELM) convergiu com {k + 1} termos da série.\n"
+    system.results = "Concluído"
+    return True
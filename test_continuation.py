@@ -0,0 +1,20 @@
+# test_continuation.py
+from continuation import run_continuation, get_load_increase
+from test_solvers import load_sample
+import solvers
+
+def test_continuation_passes_nose_reusing_factorizations():
+    system = load_sample()
+    ybus, bus_map = solvers.build_ybus(system)
+    result = run_continuation(system, ybus, bus_map)
+
+    assert result.nose_index is not None
+    assert result.nose_index < len(result.lambdas) - 1 # Traçou a parte de baixo da curva
+    assert result.nose_lambda > 1.0
+    assert result.factorizations < len(result.lambdas)
+
+def test_load_increase_counts_only_load():
+    system = load_sample()
+    _, bus_map = solvers.build_ybus(system)
+    assert get_load_increase(system, bus_map) == sum(system.buses[num].p_load for num in bus_map)
+    assert get_load_increase(system, bus_map, {454: -100.0, 27: 100.0}) == 100.0
@@ -0,0 +1,22 @@
+# test_network_reduction.py
+import numpy as np
+from network_reduction import reduce_network
+from test_solvers import load_sample
+import solvers
+
+def test_equivalent_reproduces_base_case_without_slack():
+    """ Reduzir à área 205 (sem a referência) e resolver reproduz o caso completo. """
+    system = load_sample()
+    ybus, bus_map = solvers.build_ybus(system)
+    assert solvers.solve_newton_raphson(system, ybus, bus_map)
+    v_full = solvers.get_result_voltage(system, bus_map)
+
+    equivalent = reduce_network(system, areas=[205], network=(ybus, bus_map))
+    assert equivalent.reference_bus is not None
+    reduced = equivalent.system
+    reduced.clear_results()
+    assert solvers.solve_newton_raphson(reduced, equivalent.ybus, equivalent.bus_map)
+
+    v_red = solvers.get_result_voltage(reduced, equivalent.bus_map)
+    for num, idx in equivalent.bus_map.items():
+        assert abs(v_red[idx] - v_full[bus_map[num]]) < 1e-6
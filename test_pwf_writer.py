@@ -0,0 +1,21 @@
+# test_pwf_writer.py
+from power_system_model import PowerSystem
+from pwf_parser import parse_pwf_file
+from pwf_writer import PwfWriter
+from test_solvers import load_sample
+
+def test_dlin_round_trip_keeps_flags_and_controlled_bus(tmp_path):
+    """ Gravar e reler o caso preserva barra controlada, proprietário e flags do DLIN. """
+    system = load_sample()
+    path = tmp_path / "caso.pwf"
+    PwfWriter(system).write(str(path))
+
+    reloaded = PowerSystem()
+    reloaded.load_from_pwf(parse_pwf_file(str(path)))
+    for br_id in ('458-459-1', '458-459-2', '458-459-3'):
+        assert reloaded.branches[br_id].controlled_bus == '-459'
+    assert reloaded.branches['458-459-2'].maneuver == 'N'
+    assert reloaded.branches['454-600-1'].owner == 'T'
+    assert reloaded.branches['3383-41956-3'].controlled_bus == '3384'
+    for br_id, branch in system.branches.items():
+        assert vars(reloaded.branches[br_id]) == vars(branch)
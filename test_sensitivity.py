@@ -0,0 +1,39 @@
+# test_sensitivity.py
+import pytest
+from sensitivity import SensitivityAnalyzer
+from test_solvers import load_sample
+import solvers
+
+def solved_sample():
+    system = load_sample()
+    ybus, bus_map = solvers.build_ybus(system)
+    assert solvers.solve_newton_raphson(system, ybus, bus_map)
+    return system, SensitivityAnalyzer(system, ybus, bus_map)
+
+def test_edit_then_sensitivity_uses_new_network():
+    """ Depois de uma alteração, a fatoração antiga não é reaproveitada. """
+    system, analyzer = solved_sample()
+    assert abs(analyzer.self_dv_dq([461])[461] - 0.0147) < 1e-4
+
+    system.edit('branch', '461-3384-1', 'status', False)
+    with pytest.raises(ValueError, match="alterada"):
+        analyzer.self_dv_dq([461])
+
+    # Como no cálculo da interface: consome as alterações e refaz a Ybus
+    system.take_pending()
+    ybus, bus_map = solvers.build_ybus(system)
+    analyzer = SensitivityAnalyzer(system, ybus, bus_map)
+    with pytest.raises(ValueError, match="não possui"):
+        analyzer.self_dv_dq([461])
+
+    assert solvers.solve_newton_raphson(system, ybus, bus_map)
+    assert abs(analyzer.self_dv_dq([461])[461] - 0.0216) < 1e-4
+
+def test_bus_outage_then_sensitivity_does_not_use_stale_indices():
+    """ Com uma barra a menos, o pvpq antigo não é usado com o novo bus_map. """
+    system, analyzer = solved_sample()
+    system.edit('bus', 458, 'status', False)
+    system.take_pending()
+    ybus, bus_map = solvers.build_ybus(system)
+    with pytest.raises(ValueError, match="não possui"):
+        SensitivityAnalyzer(system, ybus, bus_map).self_dv_dq([461])
@@ -0,0 +1,60 @@
+# test_solution_cache.py
+import numpy as np
+from solution_cache import SolutionCache
+from test_solvers import load_sample
+import solvers
+
+def solved_sample():
+    system = load_sample()
+    ybus, bus_map = solvers.build_ybus(system)
+    assert solvers.solve_newton_raphson(system, ybus, bus_map)
+    return system, bus_map
+
+def test_exact_hit_returns_stored_solution():
+    system, bus_map = solved_sample()
+    cache = SolutionCache()
+    assert cache.store(system, bus_map)
+
+    exact, V = cache.lookup(system, bus_map)
+    assert exact
+    assert np.allclose(V, solvers.get_result_voltage(system, bus_map))
+
+def test_changed_injection_gives_warm_start():
+    system, bus_map = solved_sample()
+    cache = SolutionCache()
+    cache.store(system, bus_map)
+
+    system.edit('bus', 454, 'p_load', system.buses[454].p_load + 10.0)
+    exact, V = cache.lookup(system, bus_map)
+    assert not exact
+    assert V is not None
+
+def test_reference_angle_is_part_of_the_key():
+    """ Mudar o ângulo da referência não pode reaproveitar a solução antiga. """
+    system, bus_map = solved_sample()
+    cache = SolutionCache()
+    cache.store(system, bus_map)
+
+    system.edit('bus', 27, 'angle', 0.0)
+    exact, _ = cache.lookup(system, bus_map)
+    assert not exact
+
+def test_lru_eviction_drops_least_recently_used():
+    system, bus_map = solved_sample()
+    cache = SolutionCache(max_entries=2)
+    loads = (100.0, 200.0, 300.0)
+    for p_load in loads[:2]:
+        system.buses[454].p_load = p_load
+        cache.store(system, bus_map)
+
+    # Consultar o primeiro o torna o mais recente; o segundo é descartado
+    system.buses[454].p_load = loads[0]
+    assert cache.lookup(system, bus_map)[0]
+    system.buses[454].p_load = loads[2]
+    cache.store(system, bus_map)
+    assert len(cache) == 2
+
+    system.buses[454].p_load = loads[1]
+    assert not cache.lookup(system, bus_map)[0]
+    system.buses[454].p_load = loads[0]
+    assert cache.lookup(system, bus_map)[0]
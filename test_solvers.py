@@ -0,0 +1,67 @@
+# test_solvers.py
+import os
+import numpy as np
+from power_system_model import PowerSystem
+from pwf_parser import parse_pwf_file
+import solvers
+
+SAMPLE_CASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ASP-2025-TRTAP.PWF")
+
+def load_sample():
+    system = PowerSystem()
+    system.load_from_pwf(parse_pwf_file(SAMPLE_CASE))
+    return system
+
+def test_newton_raphson_solves_sample_case():
+    """ O caso de exemplo (já resolvido no ANAREDE) converge em poucas iterações. """
+    system = load_sample()
+    ybus, bus_map = solvers.build_ybus(system)
+    assert solvers.solve_newton_raphson(system, ybus, bus_map)
+    assert "convergiu em 3 iterações" in system.log
+
+    bus = system.buses[454]
+    assert abs(bus.v_result - 0.994) < 1e-3
+    assert abs(bus.angle_result - (-41.4)) < 0.1
+
+def test_newton_raphson_islanded_bus_does_not_raise():
+    """ Uma contingência que ilha uma barra retorna False em vez de exceção. """
+    system = load_sample()
+    for branch in system.branches.values():
+        if 459 in (branch.from_bus, branch.to_bus):
+            branch.status = False
+    ybus, bus_map = solvers.build_ybus(system)
+    assert not solvers.solve_newton_raphson(system, ybus, bus_map)
+    assert "singular" in system.log
+
+def test_helm_matches_newton_raphson():
+    """ HELM chega à mesma solução do Newton-Raphson no caso de exemplo. """
+    system = load_sample()
+    ybus, bus_map = solvers.build_ybus(system)
+    assert solvers.solve_newton_raphson(system, ybus, bus_map)
+    v_nr = solvers.get_result_voltage(system, bus_map)
+
+    system.clear_results()
+    assert solvers.solve_helm(system, ybus, bus_map)
+    assert np.max(np.abs(solvers.get_result_voltage(system, bus_map) - v_nr)) < 1e-5
+
+def test_helm_islanded_bus_does_not_raise():
+    """ Como no Newton-Raphson, a barra ilhada retorna False em vez de exceção. """
+    system = load_sample()
+    for branch in system.branches.values():
+        if 459 in (branch.from_bus, branch.to_bus):
+            branch.status = False
+    ybus, bus_map = solvers.build_ybus(system)
+    assert not solvers.solve_helm(system, ybus, bus_map)
+    assert "singular" in system.log
+
+def test_helm_stops_when_mismatch_stalls():
+    """ Sem solução (carga muito acima do limite), o HELM desiste antes do máximo de termos. """
+    system = load_sample()
+    for bus in system.buses.values():
+        bus.p_load *= 4
+        bus.q_load *= 4
+        bus.p_gen *= 4
+    ybus, bus_map = solvers.build_ybus(system)
+    assert not solvers.solve_helm(system, ybus, bus_map, max_terms=60)
+    assert "sem melhora" in system.log
+    assert "não convergiu com 60 termos" not in system.log
@@ -0,0 +1,167 @@
+# time_series.py
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from numpy.lib.format import open_memmap
+from power_system_model import PowerSystem
+from post_processing import BranchFlows
+import solvers
+
+# Sufixos aceitos no cabeçalho do CSV de perfis ("<barra>_<sufixo>")
+PROFILE_FIELDS = {
+    'PL': 'p_load',
+    'QL': 'q_load',
+    'PG': 'p_gen',
+    'QG': 'q_gen',
+}
+
+# Arquivos colunares gerados: {nome: (dimensão, dtype)}
+OUTPUT_COLUMNS = {
+    'v': ('bus', np.float64),
+    'angle': ('bus', np.float64),
+    'p_from': ('branch', np.float64),
+    'q_from': ('branch', np.float64),
+    'p_to': ('branch', np.float64),
+    'q_to': ('branch', np.float64),
+    'converged': ('step', np.bool_),
+}
+
+def load_profiles_csv(filepath: str):
+    """
+    Lê perfis de carga/geração de um CSV (ex: 8760 valores horários).
+    A primeira coluna é o rótulo do passo (data/hora); as demais têm
+    cabeçalho "<barra>_<PL|QL|PG|QG>" e valores absolutos em MW/MVAr.
+    Retorna (rótulos, {(barra, atributo): array}).
+    """
+    with open(filepath, 'r', encoding='latin-1', newline='') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        reader = csv.reader(f, dialect)
+        header = next(reader)
+        rows = [row for row in reader if row and any(cell.strip() for cell in row)]
+
+    labels = [row[0].strip() for row in rows]
+    values = np.array([[float(cell.replace(',', '.')) if cell.strip() else np.nan for cell in row[1:len(header)]]
+                       for row in rows])
+
+    profiles = {}
+    for col, name in enumerate(header[1:]):
+        bus_str, _, field = name.strip().rpartition('_')
+        if not bus_str.isdigit() or field.upper() not in PROFILE_FIELDS:
+            print(f"Aviso: Coluna de perfil '{name}' ignorada.")
+            continue
+        profiles[(int(bus_str), PROFILE_FIELDS[field.upper()])] = values[:, col]
+    return labels, profiles
+
+def _apply_profile_step(system, profiles, step):
+    for (bus_num, attr), series in profiles.items():
+        value = series[step]
+        if not np.isnan(value):
+            setattr(system.buses[bus_num], attr, float(value))
+
+def _run_chunk(system, ybus, bus_map, profiles, start, stop, v_start, output_dir, max_iter, tolerance):
+    """
+    Executa os passos [start, stop) de uma série temporal num processo
+    de trabalho (profiles já recortados para o trecho). Cada passo parte
+    da solução do passo anterior e o trecho é gravado de uma vez nos
+    arquivos colunares (memmap).
+    """
+    flows = BranchFlows(system, bus_map)
+    n_steps = stop - start
+    n_br = len(flows.branch_ids)
+    buffers = {
+        'v': np.full((n_steps, len(bus_map)), np.nan),
+        'angle': np.full((n_steps, len(bus_map)), np.nan),
+        'p_from': np.full((n_steps, n_br), np.nan),
+        'q_from': np.full((n_steps, n_br), np.nan),
+        'p_to': np.full((n_steps, n_br), np.nan),
+        'q_to': np.full((n_steps, n_br), np.nan),
+        'converged': np.zeros(n_steps, dtype=np.bool_),
+    }
+
+    V = v_start
+    for i in range(n_steps):
+        _apply_profile_step(system, profiles, i)
+        system.clear_results()
+        if not solvers.solve_newton_raphson(system, ybus, bus_map, max_iter=max_iter,
+                                            tolerance=tolerance, v0=V):
+            continue # Mantém NaN no passo e segue do último ponto convergido
+
+        V = solvers.get_result_voltage(system, bus_map)
+        s_from, s_to, _, _ = flows.compute(V)
+        buffers['v'][i] = np.abs(V)
+        buffers['angle'][i] = np.degrees(np.angle(V))
+        buffers['p_from'][i], buffers['q_from'][i] = s_from.real, s_from.imag
+        buffers['p_to'][i], buffers['q_to'][i] = s_to.real, s_to.imag
+        buffers['converged'][i] = True
+
+    for name, data in buffers.items():
+        column = open_memmap(os.path.join(output_dir, f"{name}.npy"), mode='r+')
+        column[start:stop] = data
+        column.flush()
+        del column
+    return start, stop, int(buffers['converged'].sum())
+
+def run_time_series(system: PowerSystem, ybus, bus_map, labels, profiles, output_dir,
+                    n_workers=None, chunk_size=None, max_iter=20, tolerance=1e-5, progress=None):
+    """
+    Simulação quase-estática: aplica os perfis por barra ao caso base e
+    resolve um fluxo de potência a cada passo.
+
+    O horizonte é dividido em trechos distribuídos entre processos; dentro
+    de cada trecho os passos são resolvidos em sequência com partida a
+    quente. Tensões, ângulos e fluxos nos ramos vão para arquivos .npy
+    colunares (ordem Fortran: cada barra/ramo é contíguo) em output_dir,
+    escritos à medida que os trechos terminam. Um index.json descreve
+    barras, ramos e rótulos dos passos.
+    """
+    n_steps = len(labels)
+    profiles = {key: series for key, series in profiles.items() if key[0] in bus_map}
+    log = f"Iniciando Série Temporal ({n_steps} passos, {len(profiles)} perfis)...\n"
+    print(log.strip())
+
+    # Caso base: ponto de partida de todos os trechos
+    if not solvers.solve_newton_raphson(system, ybus, bus_map, max_iter=max_iter, tolerance=tolerance):
+        system.log = log + "Caso base não convergiu. Série temporal abortada.\n"
+        return False
+    v_base = solvers.get_result_voltage(system, bus_map)
+    branch_ids = BranchFlows(system, bus_map).branch_ids
+
+    os.makedirs(output_dir, exist_ok=True)
+    sizes = {'bus': len(bus_map), 'branch': len(branch_ids)}
+    for name, (dim, dtype) in OUTPUT_COLUMNS.items():
+        shape = (n_steps,) if dim == 'step' else (n_steps, sizes[dim])
+        column = open_memmap(os.path.join(output_dir, f"{name}.npy"), mode='w+',
+                             dtype=dtype, shape=shape, fortran_order=True)
+        del column
+
+    bus_numbers = sorted(bus_map, key=bus_map.get)
+    with open(os.path.join(output_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({'title': system.title, 'buses': bus_numbers, 'branches': branch_ids,
+                   'steps': labels}, f, ensure_ascii=False)
+
+    n_workers = n_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(24, -(-n_steps // (4 * n_workers)))
+    chunks = [(start, min(start + chunk_size, n_steps)) for start in range(0, n_steps, chunk_size)]
+
+    converged = 0
+    done = 0
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(_run_chunk, system, ybus, bus_map,
+                               {key: series[start:stop] for key, series in profiles.items()},
+                               start, stop, v_base, output_dir, max_iter, tolerance)
+                   for start, stop in chunks]
+        for future in as_completed(futures):
+            _, _, chunk_converged = future.result()
+            converged += chunk_converged
+            done += 1
+            if progress:
+                progress(done, len(chunks))
+
+    log += f"{converged} de {n_steps} passos convergiram ({len(chunks)} trechos, {n_workers} processos).\n"
+    log += f"Resultados gravados em: {output_dir}\n"
+    system.log = log
+    return converged == n_steps